@@ -0,0 +1,740 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for overseerr-reconcile.py
+
+Starts local stub Overseerr, Sonarr and Radarr servers filled with synthetic
+data, runs the reconciler against them and reports wall time, HTTP calls per
+endpoint and peak RSS. Nothing talks to the real services, so runs are
+repeatable and safe to use for before/after comparisons.
+
+Usage:
+    python overseerr-reconcile-bench.py                # Check and sync, default sizes
+    python overseerr-reconcile-bench.py --mode check --requests 2000
+    python overseerr-reconcile-bench.py --latency 0.05 --error-rate 0.02
+    python overseerr-reconcile-bench.py -- --concurrency sonarr=4,radarr=4,overseerr=4
+    python overseerr-reconcile-bench.py --json results.json   # Machine-readable results
+
+Arguments after `--` are passed through to the reconciler unchanged.
+"""
+
+import argparse
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+RECONCILER = Path(__file__).with_name("overseerr-reconcile.py")
+API_KEY = "bench"
+
+# Overseerr request and media status codes
+REQUEST_APPROVED = 2
+REQUEST_FAILED = 4
+MEDIA_PROCESSING = 3
+MEDIA_AVAILABLE = 5
+
+# Numeric path segments are collapsed so calls group by endpoint
+ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+@dataclass
+class Dataset:
+    """Synthetic library and request data shared by all three stubs"""
+
+    series: Dict[int, Dict] = field(default_factory=dict)  # tvdbId -> series
+    movies: Dict[int, Dict] = field(default_factory=dict)  # tmdbId -> movie
+    requests: List[Dict] = field(default_factory=list)
+    tv_tmdb_to_tvdb: Dict[int, int] = field(default_factory=dict)
+
+
+def image_list(slug: str) -> List[Dict]:
+    """The poster/fanart/banner block every *arr entry carries"""
+    return [
+        {
+            "coverType": kind,
+            "url": f"/MediaCover/{slug}/{kind}.jpg",
+            "remoteUrl": f"https://image.example/{slug}/{kind}.jpg",
+        }
+        for kind in ("poster", "fanart", "banner")
+    ]
+
+
+def make_series(arr_id: int, tvdb_id: int, tmdb_id: int, rng: random.Random) -> Dict:
+    title = f"Bench Series {tvdb_id}"
+    slug = f"bench-series-{tvdb_id}"
+    seasons: List[Dict[str, Any]] = []
+    for number in range(1, rng.randint(1, 8) + 1):
+        episodes = rng.randint(6, 24)
+        have = episodes if rng.random() < 0.9 else rng.randint(0, episodes)
+        seasons.append(
+            {
+                "seasonNumber": number,
+                "monitored": rng.random() < 0.95,
+                "statistics": {
+                    "episodeFileCount": have,
+                    "episodeCount": episodes,
+                    "totalEpisodeCount": episodes,
+                    "sizeOnDisk": have * 1_500_000_000,
+                    "percentOfEpisodes": 100.0 * have / episodes,
+                },
+            }
+        )
+    files = sum(s["statistics"]["episodeFileCount"] for s in seasons)
+    total = sum(s["statistics"]["episodeCount"] for s in seasons)
+    return {
+        "id": arr_id,
+        "title": title,
+        "sortTitle": title.lower(),
+        "titleSlug": slug,
+        "tvdbId": tvdb_id,
+        "tmdbId": tmdb_id,
+        "imdbId": f"tt{tvdb_id:07d}",
+        "status": "continuing",
+        "overview": "Synthetic series generated for benchmarking. " * 4,
+        "network": "Bench Network",
+        "year": 1990 + tvdb_id % 35,
+        "path": f"/media/tv/{title}",
+        "qualityProfileId": 1,
+        "monitored": True,
+        "seasonFolder": True,
+        "images": image_list(slug),
+        "genres": ["Drama", "Comedy"],
+        "tags": [],
+        "seasons": seasons,
+        "statistics": {
+            "seasonCount": len(seasons),
+            "episodeFileCount": files,
+            "episodeCount": total,
+            "totalEpisodeCount": total,
+            "sizeOnDisk": files * 1_500_000_000,
+            "percentOfEpisodes": 100.0 * files / total,
+        },
+        "added": "2024-01-01T00:00:00Z",
+    }
+
+
+def make_movie(arr_id: int, tmdb_id: int, rng: random.Random) -> Dict:
+    title = f"Bench Movie {tmdb_id}"
+    slug = f"bench-movie-{tmdb_id}"
+    has_file = rng.random() < 0.9
+    return {
+        "id": arr_id,
+        "title": title,
+        "sortTitle": title.lower(),
+        "titleSlug": slug,
+        "tmdbId": tmdb_id,
+        "imdbId": f"tt{tmdb_id:07d}",
+        "year": 1970 + tmdb_id % 55,
+        "status": "released",
+        "overview": "Synthetic movie generated for benchmarking. " * 4,
+        "studio": "Bench Studios",
+        "path": f"/media/movies/{title}",
+        "qualityProfileId": 1,
+        "monitored": True,
+        "hasFile": has_file,
+        "sizeOnDisk": 8_000_000_000 if has_file else 0,
+        "runtime": 110,
+        "images": image_list(slug),
+        "genres": ["Action"],
+        "tags": [],
+        "alternateTitles": [
+            {"title": f"{title} ({lang})", "sourceType": "tmdb"}
+            for lang in ("de", "fr")
+        ],
+        "ratings": {"imdb": {"votes": 1000, "value": 7.1}},
+        "added": "2024-01-01T00:00:00Z",
+    }
+
+
+def generate(
+    num_requests: int,
+    num_series: int,
+    num_movies: int,
+    missing: float,
+    seed: int,
+    duplicates: float = 0.0,
+) -> Dataset:
+    """Build a library and a set of approved requests against it
+
+    Requests are split between TV and movies in proportion to the library
+    sizes. Roughly `missing` of them point at titles the *arr doesn't have,
+    and a quarter of those are marked failed in Overseerr. A `duplicates`
+    share of the missing ones re-request an earlier missing title, the way
+    per-season or per-user requests for the same show do.
+    """
+    rng = random.Random(seed)
+    data = Dataset()
+    tvdb_id: Optional[int]
+    service_id: Optional[int]
+    for arr_id in range(1, num_series + 1):
+        tvdb_id, tmdb_id = 100_000 + arr_id, 500_000 + arr_id
+        data.series[tvdb_id] = make_series(arr_id, tvdb_id, tmdb_id, rng)
+        data.tv_tmdb_to_tvdb[tmdb_id] = tvdb_id
+    for arr_id in range(1, num_movies + 1):
+        tmdb_id = 1_000_000 + arr_id
+        data.movies[tmdb_id] = make_movie(arr_id, tmdb_id, rng)
+
+    tv_share = num_series / max(1, num_series + num_movies)
+    series_ids, movie_ids = list(data.series), list(data.movies)
+    missing_tv: List[Tuple[int, int]] = []
+    missing_movies: List[int] = []
+    for request_id in range(1, num_requests + 1):
+        is_tv = rng.random() < tv_share
+        is_missing = rng.random() < missing
+        if is_tv:
+            if is_missing and missing_tv and duplicates and rng.random() < duplicates:
+                tvdb_id, tmdb_id = rng.choice(missing_tv)
+                service_id = None
+            elif is_missing or not series_ids:
+                tvdb_id = 900_000 + request_id
+                tmdb_id = 1_900_000 + request_id
+                data.tv_tmdb_to_tvdb[tmdb_id] = tvdb_id
+                missing_tv.append((tvdb_id, tmdb_id))
+                service_id = None
+            else:
+                entry = data.series[rng.choice(series_ids)]
+                tvdb_id, tmdb_id, service_id = (
+                    entry["tvdbId"],
+                    entry["tmdbId"],
+                    entry["id"],
+                )
+        else:
+            tvdb_id = None
+            if (
+                is_missing
+                and missing_movies
+                and duplicates
+                and rng.random() < duplicates
+            ):
+                tmdb_id, service_id = rng.choice(missing_movies), None
+            elif is_missing or not movie_ids:
+                tmdb_id, service_id = 2_900_000 + request_id, None
+                missing_movies.append(tmdb_id)
+            else:
+                entry = data.movies[rng.choice(movie_ids)]
+                tmdb_id, service_id = entry["tmdbId"], entry["id"]
+
+        stamp = (
+            f"2025-{1 + request_id % 12:02d}-{1 + request_id % 28:02d}T12:00:00.000Z"
+        )
+        seasons = []
+        if is_tv:
+            seasons = [
+                {
+                    "id": request_id * 10 + n,
+                    "seasonNumber": n,
+                    "status": REQUEST_APPROVED,
+                }
+                for n in range(1, rng.randint(1, 3) + 1)
+            ]
+        failed = is_missing and rng.random() < 0.25
+        # Overseerr lags behind the *arrs: some present items aren't available yet
+        available = service_id is not None and rng.random() > 0.05
+        data.requests.append(
+            {
+                "id": request_id,
+                "status": REQUEST_FAILED if failed else REQUEST_APPROVED,
+                "type": "tv" if is_tv else "movie",
+                "is4k": False,
+                "createdAt": stamp,
+                "updatedAt": stamp,
+                "requestedBy": {"id": 1, "displayName": "bench"},
+                "modifiedBy": {"id": 1, "displayName": "bench"},
+                "seasons": seasons,
+                # Like the real API, media carries IDs and status but no title
+                "media": {
+                    "id": request_id,
+                    "mediaType": "tv" if is_tv else "movie",
+                    "tmdbId": tmdb_id,
+                    "tvdbId": tvdb_id,
+                    "status": MEDIA_AVAILABLE if available else MEDIA_PROCESSING,
+                    "status4k": 1,
+                    "serviceId": None if service_id is None else 0,
+                    "serviceId4k": None,
+                    "externalServiceId": service_id,
+                    "externalServiceId4k": None,
+                    "externalServiceSlug": None,
+                    "createdAt": stamp,
+                    "updatedAt": stamp,
+                },
+            }
+        )
+    return data
+
+
+class StubServer(ThreadingHTTPServer):
+    """One fake backend: routes, injected latency/errors and call counting"""
+
+    daemon_threads = True
+    # Large libraries mean large bursts of parallel connections
+    request_queue_size = 128
+
+    def __init__(
+        self, name: str, data: Dataset, latency: float, error_rate: float, seed: int
+    ):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.name = name
+        self.data = data
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.calls: Counter = Counter()
+        self.bytes_sent = 0
+        self.lock = threading.Lock()
+        self._library_body: Optional[bytes] = None
+        self._library_size = 0
+        self._next_id = 10_000_000
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def record(self, method: str, path: str) -> bool:
+        """Count a call; returns True if this one should fail"""
+        with self.lock:
+            self.calls[f"{method} {ID_SEGMENT.sub('/{id}', path)}"] += 1
+            return self.rng.random() < self.error_rate
+
+    def library_body(self) -> bytes:
+        """The full library listing, encoded once until the library changes"""
+        items = self.data.series if self.name == "sonarr" else self.data.movies
+        with self.lock:
+            # Overseerr retries add items behind this server's back
+            if self._library_body is None or self._library_size != len(items):
+                self._library_body = json.dumps(list(items.values())).encode()
+                self._library_size = len(items)
+            return self._library_body
+
+    def add(self, payload: Dict) -> Dict:
+        """Store a new series/movie posted by the reconciler"""
+        with self.lock:
+            self._next_id += 1
+            arr_id = self._next_id
+            self._library_body = None
+        rng = random.Random(arr_id)
+        if self.name == "sonarr":
+            tvdb_id = payload["tvdbId"]
+            entry = make_series(arr_id, tvdb_id, payload.get("tmdbId", 0), rng)
+            self.data.series[tvdb_id] = entry
+        else:
+            tmdb_id = payload["tmdbId"]
+            entry = make_movie(arr_id, tmdb_id, rng)
+            self.data.movies[tmdb_id] = entry
+        return entry
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Minimal Overseerr/Sonarr/Radarr API surface used by the reconciler"""
+
+    server: StubServer
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def do_PUT(self):
+        self._dispatch("PUT")
+
+    def _dispatch(self, method: str):
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"null") if length else None
+
+        fail = self.server.record(method, url.path)
+        if self.server.latency:
+            time.sleep(self.server.latency * (0.5 + self.server.rng.random()))
+        if self.headers.get("X-Api-Key") != API_KEY:
+            return self._send(401, {"message": "Unauthorized"})
+        if fail:
+            status = 429 if self.server.rng.random() < 0.5 else 503
+            return self._send(
+                status, {"message": "injected failure"}, {"Retry-After": "1"}
+            )
+
+        route = getattr(self, f"_{self.server.name}", None)
+        try:
+            result = route(method, url.path, query, body) if route else None
+        except (KeyError, ValueError, TypeError) as e:
+            return self._send(400, {"message": str(e)})
+        if result is None:
+            return self._send(404, {"message": "Not Found"})
+        if isinstance(result, bytes):
+            return self._send_raw(200, result)
+        return self._send(200, result)
+
+    def _overseerr(self, method: str, path: str, query: Dict, body) -> object:
+        data = self.server.data
+        if method == "GET" and path == "/api/v1/request":
+            take, skip = int(query.get("take", 20)), int(query.get("skip", 0))
+            results = data.requests
+            wanted = {"approved": REQUEST_APPROVED, "failed": REQUEST_FAILED}
+            if query.get("filter") in wanted:
+                status = wanted[query["filter"]]
+                results = [r for r in results if r["status"] == status]
+            if query.get("mediaType") in ("movie", "tv"):
+                results = [r for r in results if r["type"] == query["mediaType"]]
+            if query.get("sort") == "modified":
+                results = sorted(results, key=lambda r: r["updatedAt"], reverse=True)
+            return {
+                "pageInfo": {
+                    "pages": max(1, -(-len(results) // take)),
+                    "pageSize": take,
+                    "results": len(results),
+                    "page": skip // take + 1,
+                },
+                "results": results[skip : skip + take],
+            }
+        match = re.fullmatch(r"/api/v1/request/(\d+)(/retry)?", path)
+        if match:
+            request_id = int(match.group(1))
+            if not 1 <= request_id <= len(data.requests):
+                return None
+            request = data.requests[request_id - 1]
+            if match.group(2) and method == "POST":
+                self._send_to_arr(request)
+            return request
+        match = re.fullmatch(r"/api/v1/(movie|tv)/(\d+)", path)
+        if match and method == "GET":
+            kind, tmdb_id = match.group(1), int(match.group(2))
+            label = "Movie" if kind == "movie" else "Series"
+            key = "title" if kind == "movie" else "name"
+            return {
+                "id": tmdb_id,
+                key: f"Bench {label} {tmdb_id}",
+                "overview": "x" * 400,
+            }
+        return None
+
+    def _send_to_arr(self, request: Dict):
+        """What a retry does: push the request's media into Sonarr/Radarr"""
+        media = request["media"]
+        rng = random.Random(request["id"])
+        arr_id = 5_000_000 + request["id"]
+        if request["type"] == "tv":
+            series = self.server.data.series
+            if media["tvdbId"] not in series:
+                series[media["tvdbId"]] = make_series(
+                    arr_id, media["tvdbId"], media["tmdbId"], rng
+                )
+        elif media["tmdbId"] not in self.server.data.movies:
+            self.server.data.movies[media["tmdbId"]] = make_movie(
+                arr_id, media["tmdbId"], rng
+            )
+        request["status"] = REQUEST_APPROVED
+
+    def _sonarr(self, method: str, path: str, query: Dict, body) -> object:
+        return self._arr(
+            method, path, query, body, "series", "tvdbId", self._lookup_series
+        )
+
+    def _radarr(self, method: str, path: str, query: Dict, body) -> object:
+        return self._arr(
+            method, path, query, body, "movie", "tmdbId", self._lookup_movie
+        )
+
+    def _arr(self, method, path, query, body, resource, id_field, lookup) -> object:
+        server = self.server
+        items = server.data.series if resource == "series" else server.data.movies
+        base = f"/api/v3/{resource}"
+        if path == "/api/v3/qualityprofile":
+            return [{"id": 1, "name": "HD-1080p"}, {"id": 2, "name": "Ultra-HD"}]
+        if path == "/api/v3/rootfolder":
+            return [
+                {
+                    "id": 1,
+                    "path": f"/media/{'tv' if resource == 'series' else 'movies'}",
+                }
+            ]
+        if path == "/api/v3/history/since":
+            return []
+        if path == "/api/v3/command" and method == "POST":
+            return {"id": 1, "name": body.get("name"), "status": "queued"}
+        if path == base and method == "GET":
+            if id_field in query:
+                entry = items.get(int(query[id_field]))
+                return [entry] if entry else []
+            return server.library_body()
+        if path == base and method == "POST":
+            return server.add(body)
+        if path == f"{base}/import" and method == "POST":
+            return [server.add(payload) for payload in body]
+        if path.startswith(f"{base}/lookup"):
+            return lookup(query)
+        match = re.fullmatch(rf"{base}/(\d+)", path)
+        if match:
+            arr_id = int(match.group(1))
+            for entry in items.values():
+                if entry["id"] == arr_id:
+                    if method == "PUT":
+                        with server.lock:
+                            entry.update(body)
+                            server._library_body = None
+                    return entry
+        return None
+
+    def _lookup_series(self, query: Dict) -> object:
+        term = query.get("term", "")
+        if not term.startswith("tvdb:"):
+            return []
+        tvdb_id = int(term[5:])
+        entry = make_series(0, tvdb_id, 0, random.Random(tvdb_id))
+        del entry["id"]
+        return [entry]
+
+    def _lookup_movie(self, query: Dict) -> object:
+        if "tmdbId" not in query:
+            return []
+        tmdb_id = int(query["tmdbId"])
+        entry = make_movie(0, tmdb_id, random.Random(tmdb_id))
+        del entry["id"]
+        return entry
+
+    def _send(
+        self, status: int, payload: object, headers: Optional[Dict[str, str]] = None
+    ):
+        self._send_raw(status, json.dumps(payload).encode(), headers)
+
+    def _send_raw(
+        self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None
+    ):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+        with self.server.lock:
+            self.server.bytes_sent += len(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@dataclass
+class RunResult:
+    """Measurements from one reconciler run"""
+
+    mode: str
+    exit_code: int
+    wall_seconds: float
+    peak_rss_mb: float
+    calls: Dict[str, Dict[str, int]]
+    bytes_sent: Dict[str, int]
+
+    @property
+    def total_calls(self) -> int:
+        return sum(sum(c.values()) for c in self.calls.values())
+
+
+def start_stubs(args: argparse.Namespace) -> Tuple[List[StubServer], Dataset]:
+    data = generate(
+        args.requests,
+        args.series,
+        args.movies,
+        args.missing,
+        args.seed,
+        args.duplicates,
+    )
+    servers = []
+    for offset, name in enumerate(("overseerr", "sonarr", "radarr")):
+        server = StubServer(
+            name, data, args.latency, args.error_rate, args.seed + offset
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+    return servers, data
+
+
+def read_peak_rss_kb(pid: int) -> int:
+    """The process's RSS high-water mark (VmHWM) in kB, or 0 if unavailable"""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return 0
+
+
+def run_once(mode: str, args: argparse.Namespace, extra: List[str]) -> RunResult:
+    """Run the reconciler once against fresh stubs and a cold cache"""
+    servers, _ = start_stubs(args)
+    overseerr, sonarr, radarr = servers
+    env = {
+        **os.environ,
+        "OVERSEERR_URL": overseerr.url,
+        "OVERSEERR_API_KEY": API_KEY,
+        "SONARR_URL": sonarr.url,
+        "SONARR_API_KEY": API_KEY,
+        "RADARR_URL": radarr.url,
+        "RADARR_API_KEY": API_KEY,
+    }
+    try:
+        with tempfile.TemporaryDirectory(prefix="reconcile-bench-") as cache_dir:
+            cmd = [
+                sys.executable,
+                str(RECONCILER),
+                f"--{mode}",
+                "--cache-dir",
+                cache_dir,
+            ]
+            if mode == "sync":
+                cmd.append("--yes")
+            cmd.extend(extra)
+            output = None if args.verbose else subprocess.DEVNULL
+            started = time.monotonic()
+            proc = subprocess.Popen(cmd, env=env, stdout=output, stderr=output)
+            peak_kb = 0
+            while True:
+                pid, status, usage = os.wait4(proc.pid, os.WNOHANG)
+                if pid:
+                    break
+                peak_kb = max(peak_kb, read_peak_rss_kb(proc.pid))
+                time.sleep(0.02)
+            wall = time.monotonic() - started
+            proc.returncode = os.waitstatus_to_exitcode(status)
+    finally:
+        for server in servers:
+            server.shutdown()
+            server.server_close()
+
+    return RunResult(
+        mode=mode,
+        exit_code=proc.returncode,
+        wall_seconds=round(wall, 3),
+        # ru_maxrss (kilobytes on Linux) is only a fallback: it survives exec,
+        # so it can report this process's own size instead of the reconciler's
+        peak_rss_mb=round((peak_kb or usage.ru_maxrss) / 1024, 1),
+        calls={s.name: dict(s.calls.most_common()) for s in servers},
+        bytes_sent={s.name: s.bytes_sent for s in servers},
+    )
+
+
+def print_result(result: RunResult):
+    print(f"\n=== --{result.mode} ===")
+    print(f"  Exit code:   {result.exit_code}")
+    print(f"  Wall time:   {result.wall_seconds:.2f}s")
+    print(f"  Peak RSS:    {result.peak_rss_mb:.1f} MB")
+    print(f"  HTTP calls:  {result.total_calls}")
+    for backend, calls in result.calls.items():
+        if not calls:
+            continue
+        size = result.bytes_sent[backend] / 1024 / 1024
+        print(f"\n  {backend} ({sum(calls.values())} calls, {size:.1f} MB received)")
+        for endpoint, count in calls.items():
+            print(f"    {count:>7}  {endpoint}")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark overseerr-reconcile.py against local stub servers"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=["check", "sync", "diff", "both"],
+        default="both",
+        help="Which reconciler mode to run; both means check then sync (default: both)",
+    )
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=10_000,
+        help="Approved requests (default: 10000)",
+    )
+    parser.add_argument(
+        "--series", type=int, default=5_000, help="Series in Sonarr (default: 5000)"
+    )
+    parser.add_argument(
+        "--movies", type=int, default=20_000, help="Movies in Radarr (default: 20000)"
+    )
+    parser.add_argument(
+        "--missing",
+        type=float,
+        default=0.02,
+        metavar="FRACTION",
+        help="Share of requests missing from Sonarr/Radarr (default: 0.02)",
+    )
+    parser.add_argument(
+        "--duplicates",
+        type=float,
+        default=0.0,
+        metavar="FRACTION",
+        help="Share of missing requests that repeat an earlier missing title "
+        "(default: 0)",
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        metavar="SECONDS",
+        help="Mean per-call latency added by the stubs (default: 0)",
+    )
+    parser.add_argument(
+        "--error-rate",
+        type=float,
+        default=0.0,
+        metavar="FRACTION",
+        help="Share of calls answered with 429/503 (default: 0)",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default: 1)")
+    parser.add_argument(
+        "--json", type=Path, metavar="FILE", help="Also write results to this file"
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="Show the reconciler's own output"
+    )
+    parser.add_argument(
+        "extra",
+        nargs=argparse.REMAINDER,
+        help="Arguments after -- are passed to the reconciler",
+    )
+    args = parser.parse_args()
+    extra = args.extra[1:] if args.extra[:1] == ["--"] else args.extra
+
+    modes = ["check", "sync"] if args.mode == "both" else [args.mode]
+    print(
+        f"📊 {args.requests} requests, {args.series} series, {args.movies} movies, "
+        f"{args.missing:.0%} missing, {args.latency * 1000:.0f}ms latency, "
+        f"{args.error_rate:.0%} errors"
+    )
+
+    results = []
+    for mode in modes:
+        print(f"⏱️  Running --{mode}...", flush=True)
+        result = run_once(mode, args, extra)
+        print_result(result)
+        results.append(result)
+
+    if args.json:
+        payload = {
+            "parameters": {
+                k: v for k, v in vars(args).items() if k not in ("json", "extra")
+            },
+            "extra_args": extra,
+            "runs": [{**asdict(r), "total_calls": r.total_calls} for r in results],
+        }
+        args.json.write_text(json.dumps(payload, indent=2, default=str) + "\n")
+        print(f"\n💾 Results written to {args.json}")
+
+    if any(r.exit_code != 0 for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,18 +10,185 @@ Usage:
     python overseerr-reconcile.py --sync           # Re-submit missing requests
     python overseerr-reconcile.py --check --type tv    # Check only TV shows
     python overseerr-reconcile.py --check --type movie # Check only movies
+    python overseerr-reconcile.py --check --concurrency sonarr=4,radarr=4
+    python overseerr-reconcile.py --sync --concurrency sonarr=4 --rate-limit sonarr=5
+    python overseerr-reconcile.py --check --refresh-cache  # Full library fetch
+    python overseerr-reconcile.py --sync --yes --resume    # After an interrupted run
+    python overseerr-reconcile.py --sync --retry-via-overseerr  # Overseerr re-sends
+    python overseerr-reconcile.py --check --report jsonl | jq .  # JSON per request
+    python overseerr-reconcile.py --diff > diff.json       # Missing/orphaned/stale
+    python overseerr-reconcile.py --sync --missing-files   # Search for no-file items
+    python overseerr-reconcile.py --check --profile-trace trace.json  # Time spent
+    python overseerr-reconcile.py --sync --yes --watch     # Run as a daemon
+    python overseerr-reconcile.py --sync --yes --serve     # Overseerr webhook receiver
+    python overseerr-reconcile.py --check --metrics-file run.prom  # For node_exporter
+
+The Sonarr/Radarr library snapshot is cached under
+$XDG_CACHE_HOME/overseerr-reconcile (default ~/.cache/overseerr-reconcile) and
+refreshed incrementally from the *arr history between full refreshes. One-shot
+runs also log every handled request to journal.jsonl there for --resume.
+
+Separate 4K Sonarr/Radarr servers are configured with SONARR_4K_URL /
+SONARR_4K_API_KEY (and the RADARR_ equivalents); 4K requests are checked
+against those. See load_arr_instances() for more than two instances.
 """
 
 import argparse
+import codecs
+import hashlib
+import hmac
+import json
+import os
+import re
+import signal
 import sys
-from dataclasses import dataclass
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import astuple, dataclass, replace
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Dict, List, Optional
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def ordered_map(
+    pool: ThreadPoolExecutor, fn: Callable[[T], R], items: Iterable[T], window: int
+) -> Iterator[R]:
+    """Like pool.map, but pulls from `items` lazily and yields in input order
+
+    At most `window` items are in flight, so a streaming input is consumed as
+    it arrives instead of being drained up front.
+    """
+    pending: "deque[Future[R]]" = deque()
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+class SingleFlight:
+    """Run a call once per key while other callers with the same key wait
+
+    Callers that arrive while a call is in flight get its result instead of
+    repeating the work. With `remember`, the result is also kept for callers
+    that arrive later, which turns a pass over a stream into one call per
+    distinct key. A call that raises is forgotten so the next caller retries.
+    """
+
+    def __init__(self, remember: bool = False) -> None:
+        self.remember = remember
+        self.shared = 0
+        self._lock = threading.Lock()
+        self._calls: Dict[Any, "Future[Any]"] = {}
+
+    def do(self, key: Any, fn: Callable[[], R]) -> Tuple[R, bool]:
+        """Return fn()'s result for `key` and whether it came from another call"""
+        with self._lock:
+            future = self._calls.get(key)
+            owner = future is None
+            if future is None:
+                future = self._calls[key] = Future()
+            else:
+                self.shared += 1
+        if not owner:
+            return future.result(), True
+
+        try:
+            value = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            with self._lock:
+                del self._calls[key]
+            raise
+        future.set_result(value)
+        if not self.remember:
+            with self._lock:
+                del self._calls[key]
+        return value, False
+
+
+def iter_json_array(
+    chunks: Iterable[bytes], fields: Optional[Tuple[str, ...]] = None
+) -> Iterator:
+    """Decode a JSON array incrementally, one element at a time
+
+    Each element is decoded with raw_decode as soon as it is complete and,
+    if `fields` is given, trimmed to those keys before the next one is read.
+    Memory use is bounded by the largest element rather than the payload.
+    A number cut by a chunk boundary continues in the next chunk:
+
+    >>> list(iter_json_array([b"[1", b"23, 4", b"5.", b"5]"]))
+    [123, 45.5]
+    """
+    decoder = json.JSONDecoder()
+    utf8 = codecs.getincrementaldecoder("utf-8")()
+    chunks = iter(chunks)
+    buf, pos = "", 0
+    opened = exhausted = False
+    while True:
+        # Skip whitespace and the punctuation between elements
+        while pos < len(buf) and buf[pos] in " \t\r\n,":
+            pos += 1
+        if pos < len(buf):
+            if not opened:
+                if buf[pos] != "[":
+                    raise ValueError("expected a JSON array")
+                opened = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Most likely an element split across chunks
+                if exhausted:
+                    raise
+            else:
+                # A number cut short by a chunk boundary decodes fine, so
+                # only trust a value once what follows it has been read
+                if exhausted or (end < len(buf) and buf[end] in " \t\r\n,]"):
+                    pos = end
+                    if fields and isinstance(value, dict):
+                        value = {k: value[k] for k in fields if k in value}
+                    yield value
+                    continue
+        elif exhausted:
+            raise ValueError("unexpected end of JSON array")
+
+        chunk = next(chunks, None)
+        exhausted = chunk is None
+        buf = buf[pos:] + utf8.decode(chunk or b"", final=exhausted)
+        pos = 0
+
 
 class MediaType(Enum):
     """Media type enum"""
@@ -30,15 +197,52 @@ class MediaType(Enum):
     TV = "tv"
 
 
+class Outcome(Enum):
+    """Result of reconciling a single request"""
+
+    PRESENT = "present"
+    MISSING = "missing"
+    ADDED = "added"
+    FAILED = "failed"
+    NO_TVDB = "no_tvdb"
+    # --missing-files: in the library but not downloaded, and searched for
+    NO_FILES = "no_files"
+    SEARCHED = "searched"
+    # In Sonarr, but requested seasons aren't monitored; and after fixing
+    UNMONITORED_SEASONS = "unmonitored_seasons"
+    MONITORED_SEASONS = "monitored_seasons"
+
+
 class RequestStatus(Enum):
     """Overseerr request status"""
 
     PENDING_APPROVAL = 1
     APPROVED = 2
     DECLINED = 3
+    FAILED = 4
+    COMPLETED = 5
 
 
-@dataclass
+class MediaStatus(Enum):
+    """Overseerr media availability status"""
+
+    UNKNOWN = 1
+    PENDING = 2
+    PROCESSING = 3
+    PARTIALLY_AVAILABLE = 4
+    AVAILABLE = 5
+
+
+# /api/v1/request?filter= values for the statuses Overseerr can filter on
+REQUEST_FILTERS = {
+    RequestStatus.PENDING_APPROVAL: "pending",
+    RequestStatus.APPROVED: "approved",
+    RequestStatus.FAILED: "failed",
+    RequestStatus.COMPLETED: "completed",
+}
+
+
+@dataclass(slots=True)
 class OverseerrRequest:
     """Overseerr request data"""
 
@@ -50,6 +254,61 @@ class OverseerrRequest:
     status: int
     requested_by: str
     created_at: str
+    updated_at: str = ""
+    is_4k: bool = False
+    # Availability of the requested quality (media.status or status4k)
+    media_status: int = 0
+    # Overseerr's link to the *arr entry for the requested quality: which of
+    # its configured servers (serviceId[4k]) and the series/movie ID there
+    # (externalServiceId[4k]). None until Overseerr has sent the request.
+    service_id: Optional[int] = None
+    external_service_id: Optional[int] = None
+    # Season numbers a TV request asked for
+    seasons: Tuple[int, ...] = ()
+
+    @property
+    def has_title(self) -> bool:
+        """Whether the request payload carried a real title"""
+        return self.title != placeholder_title(self.id)
+
+
+def placeholder_title(request_id: int) -> str:
+    """Title used when the request payload has no usable title"""
+    return f"Request #{request_id}"
+
+
+def external_id(req: OverseerrRequest) -> int:
+    """The ID Sonarr/Radarr know a request by: TVDB for TV, TMDB for movies
+
+    0 for a TV request without a TVDB ID.
+    """
+    return req.tmdb_id if req.media_type == MediaType.MOVIE else req.tvdb_id or 0
+
+
+@dataclass(slots=True)
+class ReconcileResult:
+    """Outcome of checking (and optionally adding) one request"""
+
+    request: OverseerrRequest
+    outcome: Outcome
+    title: str
+    # Requested seasons that were (or are now) monitored, for the season
+    # outcomes
+    seasons: Tuple[int, ...] = ()
+    # The request whose check/add this one shared, for duplicate requests
+    covered_by: Optional[int] = None
+
+
+@dataclass
+class ArrInstance:
+    """Connection settings for one Sonarr/Radarr server"""
+
+    name: str
+    url: str
+    api_key: str
+    is_4k: bool = False
+    quality_profile: Optional[str] = None
+    root_folder: Optional[str] = None
 
 
 @dataclass
@@ -58,58 +317,1041 @@ class Config:
 
     overseerr_url: str
     overseerr_api_key: str
-    sonarr_url: str
-    sonarr_api_key: str
-    radarr_url: str
-    radarr_api_key: str
+    sonarr: List[ArrInstance]
+    radarr: List[ArrInstance]
+
+
+@dataclass(slots=True)
+class LibraryItem:
+    """The subset of a Sonarr series / Radarr movie the reconciler needs"""
+
+    arr_id: int
+    external_id: int
+    title: str
+    monitored: bool = True
+    # Monitored, aired episodes without a file; 1 for an available movie
+    # without one
+    missing_files: int = 0
+    # Seasons that are unmonitored and not fully downloaded (series only)
+    unmonitored_seasons: Tuple[int, ...] = ()
+
+
+class LibraryIndex:
+    """In-memory ID index built from a single snapshot of each library
+
+    `libraries` maps each Sonarr/Radarr instance (ArrClient.key) to its items,
+    keyed by TVDB ID for series and TMDB ID for movies.
+    """
+
+    def __init__(
+        self,
+        libraries: Optional[Dict[str, Dict[int, LibraryItem]]] = None,
+        verify_misses: bool = False,
+    ) -> None:
+        self.libraries: Dict[str, Dict[int, LibraryItem]] = libraries or {}
+        # Cached snapshots can miss items added since the last refresh, so
+        # a miss has to be confirmed against the backend before acting on it
+        self.verify_misses = verify_misses
+        self.loaded_at = time.time()
+        self._lock = threading.Lock()
+        # Built on first use by by_arr_id()
+        self._arr_ids: Dict[str, Dict[int, LibraryItem]] = {}
+
+    def has(self, library: str, external_id: int) -> bool:
+        return external_id in self.libraries.get(library, {})
+
+    def by_arr_id(self, library: str, arr_id: int) -> Optional[LibraryItem]:
+        """Look an item up by its Sonarr/Radarr ID instead of TVDB/TMDB ID"""
+        with self._lock:
+            if library not in self._arr_ids:
+                self._arr_ids[library] = {
+                    item.arr_id: item
+                    for item in self.libraries.get(library, {}).values()
+                }
+            return self._arr_ids[library].get(arr_id)
+
+    def add(self, library: str, item: LibraryItem) -> None:
+        with self._lock:
+            self.libraries.setdefault(library, {})[item.external_id] = item
+            if library in self._arr_ids and item.arr_id:
+                self._arr_ids[library][item.arr_id] = item
+
+
+class TitleCache:
+    """LRU cache of Overseerr titles with a TTL, optionally persisted to disk"""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        max_size: int = 5000,
+        ttl: float = 7 * 24 * 3600,
+    ):
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._dirty = False
+        if path:
+            self._load()
+
+    @staticmethod
+    def key(media_type: MediaType, tmdb_id: int) -> str:
+        return f"{media_type.value}:{tmdb_id}"
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry[1] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: str, title: str) -> None:
+        with self._lock:
+            self._entries[key] = (title, time.time())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def _load(self) -> None:
+        try:
+            with open(self.path) as f:  # type: ignore[arg-type]
+                rows = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for key, title, fetched_at in rows[-self.max_size :]:
+            if now - fetched_at <= self.ttl:
+                self._entries[key] = (title, fetched_at)
+
+    def save(self) -> None:
+        """Persist entries in LRU order (oldest first)"""
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            rows = [[key, title, ts] for key, (title, ts) in self._entries.items()]
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(rows, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            print(f"  ⚠️  Could not write title cache {self.path}: {e}", file=sys.stderr)
+
+
+class LibraryCache:
+    """On-disk snapshot of the fields the reconciler needs from each library"""
+
+    VERSION = 3
+
+    def __init__(
+        self, cache_dir: Path, max_age: float, log: Callable[[str], None] = print
+    ):
+        self.cache_dir = cache_dir
+        self.max_age = max_age
+        self.log = log
+
+    def _path(self, client: "ArrClient") -> Path:
+        digest = hashlib.sha256(client.base_url.encode()).hexdigest()[:12]
+        return self.cache_dir / f"{client.library_name}-{digest}.json"
+
+    def _read(self, client: "ArrClient") -> Optional[Dict]:
+        try:
+            with open(self._path(client)) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != self.VERSION or data.get("base_url") != (
+            client.base_url
+        ):
+            return None
+        return data
+
+    def load(
+        self,
+        client: "ArrClient",
+        force_full: bool = False,
+        log: Optional[Callable[[str], None]] = None,
+    ) -> Tuple[Dict[int, LibraryItem], bool]:
+        """Return ({external_id: LibraryItem}, served_from_cache)
+
+        Progress goes to `log` when given, so that callers loading several
+        libraries at once can keep each one's messages together.
+        """
+        log = log or self.log
+        started = time.time()
+        data = None if force_full else self._read(client)
+
+        if data is None or started - data["full_refresh_at"] > self.max_age:
+            log(f"  ⬇️  Full {client.library_name} refresh...")
+            return self._full_refresh(client, started), False
+
+        items = {}
+        for row in data["items"]:
+            item = LibraryItem(*row)
+            # JSON has no tuples
+            item.unmonitored_seasons = tuple(item.unmonitored_seasons)
+            items[item.external_id] = item
+        by_arr_id = {item.arr_id: item for item in items.values()}
+
+        # Refetch anything grabbed/imported since the last run: new items,
+        # and known ones whose files or seasons may have changed. History
+        # has no deletion events, so only an item that has history and is
+        # now gone can be dropped; other deletions wait for a full refresh
+        try:
+            changed = client.get_changed_ids_since(data["updated_at"])
+        except (requests.exceptions.RequestException, ValueError) as e:
+            log(
+                f"  ⬇️  Full {client.library_name} refresh (history unavailable: {e})..."
+            )
+            return self._full_refresh(client, started), False
+        new_ids = changed - by_arr_id.keys()
+
+        def refetch(arr_id: int) -> Tuple[int, Optional[LibraryItem], bool]:
+            try:
+                return arr_id, client.get_library_item(arr_id), True
+            except requests.exceptions.RequestException:
+                return arr_id, None, False
+
+        updated = deleted = 0
+        window = client.max_concurrency * 2
+        with ThreadPoolExecutor(max_workers=client.max_concurrency) as pool:
+            for arr_id, fetched, ok in ordered_map(
+                pool, refetch, sorted(changed), window
+            ):
+                if not ok:
+                    continue  # Keep the cached entry until the next run
+                known = by_arr_id.get(arr_id)
+                if known:
+                    items.pop(known.external_id, None)
+                if fetched:
+                    items[fetched.external_id] = fetched
+                    updated += bool(known)
+                elif known:
+                    deleted += 1
+
+        age = int((started - data["full_refresh_at"]) / 60)
+        log(
+            f"  💾 Using cached {client.library_name} snapshot "
+            f"({age}m old, {len(new_ids)} new, {updated} updated, "
+            f"{deleted} deleted since last run)"
+        )
+        self.save(
+            client,
+            items,
+            full_refresh_at=data["full_refresh_at"],
+            updated_at=started,
+        )
+        return items, True
+
+    def _full_refresh(
+        self, client: "ArrClient", started: float
+    ) -> Dict[int, LibraryItem]:
+        items = client.get_library_items()
+        self.save(client, items, full_refresh_at=started, updated_at=started)
+        return items
+
+    def update(self, client: "ArrClient", items: Dict[int, LibraryItem]) -> None:
+        """Rewrite the cached items, keeping the existing refresh timestamps"""
+        data = self._read(client)
+        if data:
+            self.save(client, items, data["full_refresh_at"], data["updated_at"])
+
+    def save(
+        self,
+        client: "ArrClient",
+        items: Dict[int, LibraryItem],
+        full_refresh_at: float,
+        updated_at: float,
+    ) -> None:
+        """Write the snapshot atomically so an interrupted run can't corrupt it"""
+        path = self._path(client)
+        data = {
+            "version": self.VERSION,
+            "base_url": client.base_url,
+            "full_refresh_at": full_refresh_at,
+            "updated_at": updated_at,
+            # Placeholders for adds whose response had no ID would collide
+            # on arr ID 0; the next refresh picks the real items up
+            "items": [astuple(item) for item in items.values() if item.arr_id],
+        }
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"  ⚠️  Could not write library cache {path}: {e}", file=sys.stderr)
+
+
+class Journal:
+    """Append-only JSON-lines log of the requests a one-shot run has handled
+
+    One line per request (timestamp, request ID, action, outcome), flushed
+    as it is written so it survives the process being killed. Runs are
+    bracketed by start/complete markers: resuming skips requests that an
+    interrupted run already finished, and starts afresh after a clean finish.
+    """
+
+    # Outcomes that need no further work on a resumed run
+    DONE: ClassVar[Set[str]] = {
+        Outcome.PRESENT.value,
+        Outcome.ADDED.value,
+        Outcome.NO_TVDB.value,
+        Outcome.MONITORED_SEASONS.value,
+    }
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file: Optional[TextIO] = None
+        self._lock = threading.Lock()
+
+    def open(self, resume: bool = False) -> Set[int]:
+        """Start a run; returns the request IDs to skip when resuming"""
+        done = self._completed() if resume else set()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a" if done else "w")
+        # A killed run can leave a torn last line; start on a fresh one
+        if self._file.tell():
+            self._file.write("\n")
+        self._write(action="run", outcome="resumed" if done else "started")
+        return done
+
+    def _completed(self) -> Set[int]:
+        """Request IDs finished since the last cleanly completed run"""
+        done: Set[int] = set()
+        finished = False
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+                    if entry.get("action") == "run":
+                        finished = entry.get("outcome") == "completed"
+                    elif entry.get("outcome") in self.DONE:
+                        done.add(entry["request_id"])
+        except OSError:
+            return set()
+        return set() if finished else done
+
+    def record(self, result: ReconcileResult) -> None:
+        adding = result.outcome in (Outcome.ADDED, Outcome.FAILED)
+        self._write(
+            request_id=result.request.id,
+            action="add" if adding else "check",
+            outcome=result.outcome.value,
+        )
+
+    def close(self, completed: bool = False) -> None:
+        """Finish the run; only a completed run stops the next --resume"""
+        if self._file is None:
+            return
+        if completed:
+            self._write(action="run", outcome="completed")
+        with self._lock:
+            self._file.close()
+            self._file = None
+
+    def _write(self, **entry) -> None:
+        line = json.dumps({"ts": datetime.now(timezone.utc).isoformat(), **entry})
+        with self._lock:
+            if self._file:
+                self._file.write(line + "\n")
+                self._file.flush()
+
+
+class Reporter:
+    """Where per-request results and progress messages go"""
+
+    def info(self, message: str) -> None:
+        print(message)
+
+    def result(self, result: ReconcileResult) -> None:
+        raise NotImplementedError
+
+
+class ConsoleReporter(Reporter):
+    """Human-readable console output; requests already present stay quiet"""
+
+    def result(self, result: ReconcileResult) -> None:
+        req = result.request
+        kind = "Movie" if req.media_type == MediaType.MOVIE else "TV show"
+
+        if result.covered_by and result.outcome in (Outcome.ADDED, Outcome.FAILED):
+            print(
+                f"  🔗 {kind}: {result.title} - covered by request {result.covered_by}"
+            )
+        elif result.outcome in (Outcome.ADDED, Outcome.FAILED):
+            mark = "✅" if result.outcome == Outcome.ADDED else "❌"
+            print(f"  📤 Adding {kind.lower()}: {result.title}... {mark}")
+        elif result.outcome == Outcome.MISSING:
+            if req.media_type == MediaType.MOVIE:
+                ids = f"TMDB: {req.tmdb_id}"
+            else:
+                ids = f"TVDB: {req.tvdb_id}"
+            print(
+                f"  ❌ {kind} missing: {result.title} "
+                f"({ids}, Requested: {req.created_at[:10]})"
+            )
+        elif result.outcome == Outcome.NO_TVDB:
+            print(f"  ⚠️  No TVDB ID for: {req.title} - cannot verify")
+        elif result.outcome == Outcome.NO_FILES:
+            print(
+                f"  📭 {kind} not downloaded: {result.title} "
+                f"(Requested: {req.created_at[:10]})"
+            )
+        elif result.outcome == Outcome.SEARCHED:
+            print(f"  🔎 Searching for {kind.lower()}: {result.title}")
+        elif result.outcome in (
+            Outcome.UNMONITORED_SEASONS,
+            Outcome.MONITORED_SEASONS,
+        ):
+            seasons = ", ".join(f"S{n:02d}" for n in result.seasons)
+            if result.outcome == Outcome.MONITORED_SEASONS:
+                print(f"  📺 Monitoring {seasons} of {result.title}... ✅")
+            else:
+                print(
+                    f"  📺 Requested seasons unmonitored: {result.title} "
+                    f"({seasons}, Requested: {req.created_at[:10]})"
+                )
+
+
+class JsonlReporter(Reporter):
+    """One JSON object per request on stdout; progress goes to stderr"""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+
+    def info(self, message: str) -> None:
+        print(message, file=sys.stderr)
+
+    def result(self, result: ReconcileResult) -> None:
+        req = result.request
+        line = json.dumps(
+            {
+                "ts": datetime.now(timezone.utc).isoformat(),
+                "request_id": req.id,
+                "media_type": req.media_type.value,
+                "title": result.title,
+                "tmdb_id": req.tmdb_id,
+                "tvdb_id": req.tvdb_id,
+                "outcome": result.outcome.value,
+                "seasons": list(result.seasons),
+                "covered_by": result.covered_by,
+                "requested_by": req.requested_by,
+                "created_at": req.created_at,
+            },
+            ensure_ascii=False,
+        )
+        # serve mode reports from several worker threads
+        with self._lock:
+            print(line, flush=True)
+
+
+class Metrics:
+    """Thread-safe counters/histograms rendered in Prometheus text format
+
+    Standard library only, like the cloudflare exporter: served on /metrics
+    in --watch/--serve mode, or written/pushed once at the end of a run.
+    """
+
+    PREFIX = "overseerr_reconcile"
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self._histograms: Dict[Tuple[Tuple[str, str], ...], List[float]] = {}
+        self._gauges: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self.index: Optional["LibraryIndex"] = None
+
+    def inc(self, name: str, amount: float = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def set(self, name: str, value: float, **labels: str) -> None:
+        with self._lock:
+            self._gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def observe_request(self, backend: str, method: str, seconds: float) -> None:
+        """Record one HTTP call in the per-backend latency histogram"""
+        key = (("backend", backend), ("method", method))
+        with self._lock:
+            # Layout: one count per bucket, then +Inf count, then sum
+            hist = self._histograms.setdefault(key, [0.0] * (len(self.BUCKETS) + 2))
+            for i, bound in enumerate(self.BUCKETS):
+                if seconds <= bound:
+                    hist[i] += 1
+            hist[-2] += 1
+            hist[-1] += seconds
+
+    def record_result(self, result: "ReconcileResult") -> None:
+        self.inc(
+            "items_total",
+            media_type=result.request.media_type.value,
+            outcome=result.outcome.value,
+        )
+
+    @staticmethod
+    def _labels(pairs) -> str:
+        if not pairs:
+            return ""
+        inner = ",".join(f'{k}="{_esc(str(v))}"' for k, v in pairs)
+        return "{" + inner + "}"
+
+    def render(self) -> str:
+        p = self.PREFIX
+        help_text = {
+            "http_requests_total": ("counter", "HTTP calls made, by backend/status"),
+            "http_retries_total": ("counter", "Retries performed by the HTTP adapter"),
+            "pages_fetched_total": ("counter", "Overseerr request pages fetched"),
+            "items_total": ("counter", "Reconciled requests by media type/outcome"),
+            "prefilter_total": (
+                "counter",
+                "Library checks settled by Overseerr's *arr link vs by external ID",
+            ),
+            "coalesced_requests_total": (
+                "counter",
+                "Requests that reused another request's check/add for the same item",
+            ),
+            "retry_after_pauses_total": (
+                "counter",
+                "Times a Retry-After header paused calls to a backend",
+            ),
+            "watch_errors_total": ("counter", "Failed --watch cycles, by error"),
+            "library_items": ("gauge", "Items in the library index"),
+            "concurrency_limit": ("gauge", "Current adaptive concurrency limit"),
+            "diff_items": ("gauge", "Items in each --diff category"),
+            "last_run_timestamp_seconds": ("gauge", "Unix time of the last pass"),
+        }
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            histograms = {k: list(v) for k, v in self._histograms.items()}
+
+        if self.index is not None:
+            for library, items in self.index.libraries.items():
+                gauges[("library_items", (("backend", library),))] = len(items)
+
+        lines = []
+        for name, (mtype, text) in help_text.items():
+            series = counters if mtype == "counter" else gauges
+            rows = [(k[1], v) for k, v in series.items() if k[0] == name]
+            if not rows:
+                continue
+            lines.append(f"# HELP {p}_{name} {text}")
+            lines.append(f"# TYPE {p}_{name} {mtype}")
+            for labels, value in sorted(rows):
+                lines.append(f"{p}_{name}{self._labels(labels)} {_fmt(value)}")
+
+        if self.index is not None:
+            lines.append(
+                f"# HELP {p}_library_index_age_seconds Age of the library index"
+            )
+            lines.append(f"# TYPE {p}_library_index_age_seconds gauge")
+            age = time.time() - self.index.loaded_at
+            lines.append(f"{p}_library_index_age_seconds {age:.1f}")
+
+        if histograms:
+            name = f"{p}_http_request_duration_seconds"
+            lines.append(f"# HELP {name} HTTP call latency by backend")
+            lines.append(f"# TYPE {name} histogram")
+            for labels, hist in sorted(histograms.items()):
+                for bound, count in zip(self.BUCKETS, hist):
+                    bucket = self._labels(labels + (("le", f"{bound:g}"),))
+                    lines.append(f"{name}_bucket{bucket} {count:g}")
+                inf = self._labels(labels + (("le", "+Inf"),))
+                lines.append(f"{name}_bucket{inf} {hist[-2]:g}")
+                lines.append(f"{name}_sum{self._labels(labels)} {hist[-1]:.6f}")
+                lines.append(f"{name}_count{self._labels(labels)} {hist[-2]:g}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: Path) -> None:
+        """Write for node_exporter's textfile collector (atomic rename)"""
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(self.render())
+        os.replace(tmp_path, path)
+
+    def push(self, gateway_url: str, job: str = "overseerr-reconcile") -> None:
+        """Replace this job's metrics on a Prometheus Pushgateway"""
+        response = requests.put(
+            f"{gateway_url.rstrip('/')}/metrics/job/{job}",
+            data=self.render().encode(),
+            headers={"Content-Type": "text/plain; version=0.0.4"},
+            timeout=10,
+        )
+        response.raise_for_status()
+
+
+def _fmt(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+def _esc(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+METRICS = Metrics()
+
+
+class Profiler:
+    """Per-phase wall time and per-endpoint HTTP counts for --profile
+
+    A phase is a named section of a run (pagination, library, check...).
+    The phase stack is thread-local, so calls made from pool workers are
+    attributed to the phase the worker opened; nested phases count towards
+    every enclosing phase's busy time but each HTTP call only towards the
+    innermost. Disabled by default, when phase() and record_call() do
+    nothing.
+    """
+
+    ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.trace = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._origin = time.monotonic()
+        # name -> [entries, busy seconds, first start, last end]
+        self._phases: Dict[str, List[float]] = {}
+        # (phase, backend, "METHOD /endpoint") -> [calls, seconds, errors]
+        self._calls: Dict[Tuple[str, str, str], List[float]] = {}
+        self._events: List[Dict[str, Any]] = []
+        self._threads: Set[int] = set()
+
+    def enable(self, trace: bool = False) -> None:
+        self.enabled = True
+        self.trace = trace
+        self._origin = time.monotonic()
+
+    def _stack(self) -> List[str]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        stack = self._stack()
+        stack.append(name)
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            ended = time.monotonic()
+            stack.pop()
+            with self._lock:
+                entry = self._phases.setdefault(name, [0, 0.0, started, ended])
+                entry[0] += 1
+                entry[1] += ended - started
+                entry[2] = min(entry[2], started)
+                entry[3] = max(entry[3], ended)
+
+    def record_call(
+        self,
+        backend: str,
+        method: str,
+        endpoint: str,
+        started: float,
+        ended: float,
+        status: str,
+    ) -> None:
+        """Count one HTTP call against the current phase"""
+        if not self.enabled:
+            return
+        stack = self._stack()
+        phase = stack[-1] if stack else "other"
+        # Collapse IDs so /api/v3/series/12 and /api/v3/series/34 share a row
+        path = self.ID_SEGMENT.sub("/{id}", endpoint.split("?", 1)[0])
+        name = f"{method} {path}"
+        failed = not status.startswith(("2", "3"))
+        with self._lock:
+            entry = self._calls.setdefault((phase, backend, name), [0, 0.0, 0])
+            entry[0] += 1
+            entry[1] += ended - started
+            entry[2] += failed
+            if not self.trace:
+                return
+            tid = threading.get_ident()
+            if tid not in self._threads:
+                self._threads.add(tid)
+                self._events.append(
+                    {
+                        "name": "thread_name",
+                        "ph": "M",
+                        "pid": os.getpid(),
+                        "tid": tid,
+                        "args": {"name": threading.current_thread().name},
+                    }
+                )
+            self._events.append(
+                {
+                    "name": f"{backend} {name}",
+                    "cat": phase,
+                    "ph": "X",
+                    "ts": round((started - self._origin) * 1e6),
+                    "dur": round((ended - started) * 1e6),
+                    "pid": os.getpid(),
+                    "tid": tid,
+                    "args": {"backend": backend, "status": status},
+                }
+            )
+
+    def summary(self) -> List[str]:
+        """The phase and endpoint tables, one line per row"""
+        with self._lock:
+            phases = {k: list(v) for k, v in self._phases.items()}
+            calls = {k: list(v) for k, v in self._calls.items()}
+
+        http_by_phase: Dict[str, int] = {}
+        for (phase, _, _), (count, _, _) in calls.items():
+            http_by_phase[phase] = http_by_phase.get(phase, 0) + int(count)
+
+        lines = [
+            f"{'phase':<12} {'entries':>8} {'wall s':>9} {'busy s':>9} {'http':>7}"
+        ]
+        for name, (entries, busy, first, last) in sorted(
+            phases.items(), key=lambda kv: kv[1][2]
+        ):
+            lines.append(
+                f"{name:<12} {int(entries):>8} {last - first:>9.2f} {busy:>9.2f}"
+                f" {http_by_phase.get(name, 0):>7}"
+            )
+        if "other" in http_by_phase and "other" not in phases:
+            lines.append(
+                f"{'other':<12} {'':>8} {'':>9} {'':>9} {http_by_phase['other']:>7}"
+            )
+
+        lines.append("")
+        lines.append(
+            f"{'phase':<12} {'backend':<12} {'endpoint':<36} {'calls':>7}"
+            f" {'total s':>9} {'avg ms':>8} {'errors':>6}"
+        )
+        for (phase, backend, name), (count, seconds, errors) in sorted(
+            calls.items(), key=lambda kv: -kv[1][1]
+        ):
+            lines.append(
+                f"{phase:<12} {backend:<12} {name:<36} {int(count):>7}"
+                f" {seconds:>9.2f} {seconds / count * 1000:>8.1f} {int(errors):>6}"
+            )
+        return lines
+
+    def write_trace(self, path: Path) -> None:
+        """Write every recorded HTTP call in Chrome trace-event format
+
+        Open it in chrome://tracing or https://ui.perfetto.dev.
+        """
+        with self._lock:
+            events = list(self._events)
+        path.write_text(json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}))
+
+
+PROFILER = Profiler()
+
+
+class StatsProfiler:
+    """cProfile for --profile-stats, covering the worker threads too
+
+    Before Python 3.12 a cProfile.Profile only sees the thread that enabled
+    it, and nearly all of a run happens in pool workers. Each thread started
+    while profiling gets its own profile, and they are merged into one dump.
+    From 3.12 a single profile already covers every thread.
+    """
+
+    def __init__(self) -> None:
+        import cProfile
+
+        self._new_profile = cProfile.Profile
+        self._profiles = [cProfile.Profile()]
+        self._per_thread = sys.version_info < (3, 12)
+        self._lock = threading.Lock()
+
+    def _start_thread(self, frame: Any, event: str, arg: Any) -> None:
+        # Runs on a new thread's first event; enable() replaces this hook
+        profile = self._new_profile()
+        with self._lock:
+            self._profiles.append(profile)
+        profile.enable()
+
+    def start(self) -> None:
+        if self._per_thread:
+            threading.setprofile(self._start_thread)
+        self._profiles[0].enable()
+
+    def dump(self, path: Path) -> None:
+        """Stop profiling and write the merged stats"""
+        import pstats
+
+        self._profiles[0].disable()
+        threading.setprofile(None)
+        with self._lock:
+            profiles = list(self._profiles)
+        stats = pstats.Stats(profiles[0])
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.dump_stats(path)
+
+
+class CountingRetry(Retry):
+    """urllib3 Retry that reports each retry attempt to a callback"""
+
+    def __init__(self, *args, on_retry: Optional[Callable] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.on_retry = on_retry
+
+    def new(self, **kwargs):
+        # Retry objects are immutable; make sure copies keep the callback
+        retry = super().new(**kwargs)
+        retry.on_retry = self.on_retry
+        return retry
+
+    def increment(self, method=None, url=None, response=None, error=None, **kwargs):
+        # Raises once retries are exhausted, so only real retries are reported
+        retry = super().increment(method, url, response, error, **kwargs)
+        if self.on_retry:
+            retry_after = (
+                self.get_retry_after(response) if response is not None else None
+            )
+            self.on_retry(response, error, retry_after)
+        return retry
+
+
+class Throttle:
+    """Token bucket plus adaptive concurrency limit for one base URL
+
+    Every client talking to the same server shares one Throttle, so the
+    limits hold however many threads or clients are involved. `rate` is the
+    sustained requests per second (0 = unlimited) with bursts of up to one
+    second's worth. The concurrency limit starts at the configured cap, is
+    halved when the server answers 429/5xx (at most once per second) and
+    grows back by one slot per `limit` successful calls. A Retry-After
+    header pauses every caller until it expires.
+    """
+
+    DECREASE_INTERVAL = 1.0
+
+    _registry: ClassVar[Dict[str, "Throttle"]] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, backend: str, rate: float = 0, max_concurrency: int = 1):
+        self.backend = backend
+        self.rate = rate
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = float(self.max_concurrency)
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self._tokens = self._capacity = max(1.0, rate)
+        self._refilled_at = time.monotonic()
+        self._decreased_at = 0.0
+        self._cond = threading.Condition()
+        METRICS.set("concurrency_limit", self.limit, backend=backend)
+
+    @classmethod
+    def for_url(
+        cls, base_url: str, backend: str, rate: float = 0, max_concurrency: int = 1
+    ) -> "Throttle":
+        """The shared throttle for `base_url`; the first caller's limits win"""
+        with cls._registry_lock:
+            throttle = cls._registry.get(base_url)
+            if throttle is None:
+                throttle = cls(backend, rate, max_concurrency)
+                cls._registry[base_url] = throttle
+            return throttle
+
+    def _token_wait(self, now: float) -> float:
+        """Refill the bucket; seconds until a token is available (0 if now)"""
+        if not self.rate:
+            return 0
+        elapsed = now - self._refilled_at
+        self._tokens = min(self._capacity, self._tokens + elapsed * self.rate)
+        self._refilled_at = now
+        return 0 if self._tokens >= 1 else (1 - self._tokens) / self.rate
+
+    def acquire(self) -> None:
+        """Block until a concurrency slot and a token are both available"""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    self._cond.wait(self.paused_until - now)
+                    continue
+                if self.in_flight >= int(self.limit):
+                    self._cond.wait()
+                    continue
+                wait = self._token_wait(now)
+                if wait:
+                    self._cond.wait(wait)
+                    continue
+                if self.rate:
+                    self._tokens -= 1
+                self.in_flight += 1
+                return
+
+    def release(self) -> None:
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def record(
+        self, status: Optional[int], retry_after: Optional[float] = None
+    ) -> None:
+        """Feed back one response status (None for a connection error)
+
+        Additive increase on success, multiplicative decrease on overload.
+        """
+        overloaded = status is None or status == 429 or status >= 500
+        with self._cond:
+            now = time.monotonic()
+            if retry_after:
+                self.paused_until = max(self.paused_until, now + retry_after)
+                METRICS.inc("retry_after_pauses_total", backend=self.backend)
+            if overloaded:
+                if now - self._decreased_at < self.DECREASE_INTERVAL:
+                    return
+                self._decreased_at = now
+                self.limit = max(1.0, self.limit / 2)
+            elif self.limit < self.max_concurrency:
+                self.limit = min(
+                    float(self.max_concurrency), self.limit + 1 / self.limit
+                )
+            else:
+                return
+            METRICS.set("concurrency_limit", int(self.limit), backend=self.backend)
+            self._cond.notify_all()
 
 
 class APIClient:
     """Base API client with retry logic"""
 
-    def __init__(self, base_url: str, api_key: str):
+    backend = "api"
+    STREAM_CHUNK_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        max_concurrency: int = 1,
+        rate_limit: float = 0,
+    ):
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
+        self.max_concurrency = max(1, max_concurrency)
+        # Caps request rate and in-flight requests to this server across all
+        # worker threads, backing off when it starts to struggle
+        self.throttle = Throttle.for_url(
+            self.base_url, self.backend, rate_limit, self.max_concurrency
+        )
         self.session = self._create_session()
 
     def _create_session(self) -> requests.Session:
         """Create session with retry logic"""
         session = requests.Session()
-        retry_strategy = Retry(
+        retry_strategy = CountingRetry(
             total=3,
             backoff_factor=1,
             status_forcelist=[429, 500, 502, 503, 504],
+            on_retry=self._on_retry,
+        )
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_maxsize=max(10, self.max_concurrency),
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
         session.mount("http://", adapter)
         session.mount("https://", adapter)
         return session
 
+    def _on_retry(self, response, error, retry_after: Optional[float]) -> None:
+        reason = str(response.status) if response is not None else "error"
+        METRICS.inc("http_retries_total", backend=self.backend, reason=reason)
+        self.throttle.record(
+            response.status if response is not None else None, retry_after
+        )
+
     def get(self, endpoint: str, params: Optional[Dict] = None) -> Dict:
         """GET request with error handling"""
-        url = f"{self.base_url}{endpoint}"
-        headers = self._get_headers()
+        return self._request("GET", endpoint, params=params)
 
-        try:
-            response = self.session.get(url, headers=headers, params=params, timeout=30)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Error calling {url}: {e}", file=sys.stderr)
-            raise
+    def stream_array(
+        self,
+        endpoint: str,
+        fields: Tuple[str, ...],
+        params: Optional[Dict] = None,
+    ) -> Iterator[Dict]:
+        """GET a JSON array, yielding only `fields` of each element
+
+        The body is decoded as it downloads instead of via response.json(),
+        so a large library never sits fully decoded in memory.
+        """
+        with self._call("GET", endpoint, params=params, stream=True) as response:
+            chunks = response.iter_content(chunk_size=self.STREAM_CHUNK_SIZE)
+            try:
+                yield from iter_json_array(chunks, fields)
+            except ValueError as e:
+                raise requests.exceptions.InvalidJSONError(
+                    f"Invalid JSON array from {response.url}: {e}"
+                ) from e
 
-    def post(self, endpoint: str, data: Dict) -> Dict:
+    def post(self, endpoint: str, data: Union[Dict, List]) -> Dict:
         """POST request with error handling"""
+        return self._request("POST", endpoint, json=data)
+
+    def put(self, endpoint: str, data: Dict) -> Dict:
+        """PUT request with error handling"""
+        return self._request("PUT", endpoint, json=data)
+
+    def _request(self, method: str, endpoint: str, **kwargs) -> Dict:
+        with self._call(method, endpoint, **kwargs) as response:
+            return response.json()
+
+    @contextmanager
+    def _call(
+        self, method: str, endpoint: str, **kwargs
+    ) -> Iterator[requests.Response]:
+        """Send a request, holding a throttle slot until the body is read"""
         url = f"{self.base_url}{endpoint}"
         headers = self._get_headers()
+        status = "error"
+        started = time.monotonic()
 
+        self.throttle.acquire()
         try:
-            response = self.session.post(url, headers=headers, json=data, timeout=30)
-            response.raise_for_status()
-            return response.json()
+            response = self.session.request(
+                method, url, headers=headers, timeout=30, **kwargs
+            )
+            status = str(response.status_code)
+            self.throttle.record(response.status_code)
+            with response:
+                response.raise_for_status()
+                yield response
         except requests.exceptions.RequestException as e:
             print(f"Error calling {url}: {e}", file=sys.stderr)
             raise
+        finally:
+            self.throttle.release()
+            ended = time.monotonic()
+            METRICS.observe_request(self.backend, method, ended - started)
+            PROFILER.record_call(self.backend, method, endpoint, started, ended, status)
+            METRICS.inc(
+                "http_requests_total",
+                backend=self.backend,
+                method=method,
+                status=status,
+            )
 
     def _get_headers(self) -> Dict[str, str]:
         """Override in subclasses"""
@@ -119,93 +1361,187 @@ class APIClient:
 class OverseerrClient(APIClient):
     """Overseerr API client"""
 
+    backend = "overseerr"
+
     def _get_headers(self) -> Dict[str, str]:
         return {"X-Api-Key": self.api_key, "Content-Type": "application/json"}
 
-    def get_requests(
-        self, status: Optional[RequestStatus] = None, debug: bool = False
-    ) -> List[OverseerrRequest]:
-        """Get all requests, optionally filtered by status"""
-        all_requests = []
-        page = 1
-
-        while True:
-            params: Dict[str, int] = {"take": 50, "skip": (page - 1) * 50}
-            if status:
-                params["filter"] = "approved"  # type: ignore[assignment]
-
-            data = self.get("/api/v1/request", params=params)
-
-            if debug and page == 1 and data.get("results"):
-                import json
+    def stream_requests(
+        self,
+        status: Optional[RequestStatus] = None,
+        media_type: Optional[MediaType] = None,
+        debug: bool = False,
+        page_size: int = 50,
+    ) -> Tuple[int, Iterator[OverseerrRequest]]:
+        """Fetch the first page, then stream the rest as they download
+
+        Returns the total result count reported by Overseerr and an iterator
+        of parsed requests. Remaining pages are fetched in parallel (bounded
+        by this client's concurrency cap) and yielded in page order.
+        """
+        params: Dict[str, Union[int, str]] = {"take": page_size}
+        if status in REQUEST_FILTERS:
+            params["filter"] = REQUEST_FILTERS[status]
+        if media_type:
+            params["mediaType"] = media_type.value
+
+        with PROFILER.phase("pagination"):
+            first = self.get("/api/v1/request", params={**params, "skip": 0})
+        METRICS.inc("pages_fetched_total")
+
+        if debug and first.get("results"):
+            print("\n🔍 Debug: First request structure:", file=sys.stderr)
+            print(json.dumps(first["results"][0], indent=2), file=sys.stderr)
+            print(file=sys.stderr)
+
+        page_info = first.get("pageInfo", {})
+        total = page_info.get("results", len(first.get("results", [])))
+        pages = page_info.get("pages", 1)
+
+        def fetch_page(page: int) -> Dict:
+            with PROFILER.phase("pagination"):
+                data = self.get(
+                    "/api/v1/request",
+                    params={**params, "skip": (page - 1) * page_size},
+                )
+            METRICS.inc("pages_fetched_total")
+            return data
 
-                print("\n🔍 Debug: First request structure:", file=sys.stderr)
-                print(json.dumps(data["results"][0], indent=2), file=sys.stderr)
-                print()
+        def generate() -> Iterator[OverseerrRequest]:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as pool:
+                pending = [pool.submit(fetch_page, p) for p in range(2, pages + 1)]
+                try:
+                    yield from self._parse_page(first, status, media_type)
+                    for future in pending:
+                        yield from self._parse_page(future.result(), status, media_type)
+                finally:
+                    for future in pending:
+                        future.cancel()
 
-            if not data.get("results"):
-                break
+        return total, generate()
 
-            for req in data["results"]:
-                try:
-                    media_type = (
-                        MediaType.MOVIE if req["type"] == "movie" else MediaType.TV
-                    )
+    def get_requests_since(
+        self, cursor: str, page_size: int = 50
+    ) -> List[OverseerrRequest]:
+        """Requests created or updated at or after `cursor` (an ISO timestamp)
 
-                    # Handle different title fields - check multiple possible locations
-                    title = None
-
-                    # Try direct title/name fields
-                    if "media" in req:
-                        media = req["media"]
-                        title = (
-                            media.get("title")
-                            or media.get("name")
-                            or media.get("originalTitle")
-                            or media.get("originalName")
-                        )
-                        tmdb_id = media.get("tmdbId", 0)
-                        tvdb_id = media.get("tvdbId")
-                    else:
-                        # Fallback to root level
-                        title = req.get("title") or req.get("name")
-                        tmdb_id = req.get("tmdbId", 0)
-                        tvdb_id = req.get("tvdbId")
-
-                    # Last resort: use ID as title
-                    if not title:
-                        title = f"Request #{req['id']}"
-
-                    all_requests.append(
-                        OverseerrRequest(
-                            id=req["id"],
-                            media_type=media_type,
-                            title=title,
-                            tmdb_id=tmdb_id,
-                            tvdb_id=tvdb_id,
-                            status=req["status"],
-                            requested_by=req.get("requestedBy", {}).get(
-                                "displayName", "Unknown"
-                            ),
-                            created_at=req.get("createdAt", ""),
-                        )
-                    )
-                except (KeyError, TypeError) as e:
-                    print(
-                        f"  ⚠️  Skipping malformed request {req.get('id', 'unknown')}: {e}",
-                        file=sys.stderr,
-                    )
+        Pages through /api/v1/request newest-modified first and stops at the
+        first page that reaches past the cursor.
+        """
+        changed: List[OverseerrRequest] = []
+        skip = 0
+        while True:
+            with PROFILER.phase("pagination"):
+                data = self.get(
+                    "/api/v1/request",
+                    params={"take": page_size, "skip": skip, "sort": "modified"},
+                )
+            METRICS.inc("pages_fetched_total")
+            results = data.get("results") or []
+            for raw in results:
+                req = self._parse_request(raw)
+                if req is None:
                     continue
+                if req.updated_at < cursor:
+                    return changed
+                changed.append(req)
+            if not results or data["pageInfo"]["pages"] <= skip // page_size + 1:
+                return changed
+            skip += page_size
+
+    def get_latest_update(self) -> str:
+        """Timestamp of the most recently modified request"""
+        data = self.get(
+            "/api/v1/request", params={"take": 1, "skip": 0, "sort": "modified"}
+        )
+        for raw in data.get("results") or []:
+            req = self._parse_request(raw)
+            if req:
+                return req.updated_at
+        return ""
 
-            if data["pageInfo"]["pages"] <= page:
-                break
-            page += 1
-
-        # Filter by status if specified
-        if status:
-            all_requests = [r for r in all_requests if r.status == status.value]
+    def _parse_page(
+        self,
+        data: Dict,
+        status: Optional[RequestStatus],
+        media_type: Optional[MediaType],
+    ) -> Iterator[OverseerrRequest]:
+        for raw in data.get("results") or []:
+            req = self._parse_request(raw)
+            if req is None:
+                continue
+            # Filter by status/type if specified
+            if status and req.status != status.value:
+                continue
+            if media_type and req.media_type != media_type:
+                continue
+            yield req
+
+    def _parse_request(self, req: Dict) -> Optional[OverseerrRequest]:
+        """Convert a raw /api/v1/request result into an OverseerrRequest"""
+        try:
+            media_type = MediaType.MOVIE if req["type"] == "movie" else MediaType.TV
+
+            # Handle different title fields - check multiple possible locations
+            title = None
+
+            # Try direct title/name fields
+            if "media" in req:
+                media = req["media"]
+                title = (
+                    media.get("title")
+                    or media.get("name")
+                    or media.get("originalTitle")
+                    or media.get("originalName")
+                )
+                tmdb_id = media.get("tmdbId", 0)
+                tvdb_id = media.get("tvdbId")
+                suffix = "4k" if req.get("is4k") else ""
+                media_status = media.get(f"status{suffix}")
+                service_id = media.get(f"serviceId{suffix}")
+                external_service_id = media.get(f"externalServiceId{suffix}")
+            else:
+                # Fallback to root level
+                title = req.get("title") or req.get("name")
+                tmdb_id = req.get("tmdbId", 0)
+                tvdb_id = req.get("tvdbId")
+                media_status = 0
+                service_id = external_service_id = None
+
+            # Last resort: use ID as title
+            if not title:
+                title = placeholder_title(req["id"])
+
+            return OverseerrRequest(
+                id=req["id"],
+                media_type=media_type,
+                title=title,
+                tmdb_id=tmdb_id,
+                tvdb_id=tvdb_id,
+                status=req["status"],
+                requested_by=req.get("requestedBy", {}).get("displayName", "Unknown"),
+                created_at=req.get("createdAt", ""),
+                updated_at=req.get("updatedAt") or req.get("createdAt", ""),
+                is_4k=bool(req.get("is4k")),
+                media_status=media_status or 0,
+                service_id=service_id,
+                external_service_id=external_service_id,
+                seasons=tuple(
+                    s["seasonNumber"]
+                    for s in req.get("seasons") or []
+                    if s.get("seasonNumber") is not None
+                ),
+            )
+        except (KeyError, TypeError) as e:
+            print(
+                f"  ⚠️  Skipping malformed request {req.get('id', 'unknown')}: {e}",
+                file=sys.stderr,
+            )
+            return None
 
-        return all_requests
+    def get_request(self, request_id: int) -> Optional[OverseerrRequest]:
+        """Fetch a single request by ID"""
+        return self._parse_request(self.get(f"/api/v1/request/{request_id}"))
 
     def retry_request(self, request_id: int) -> bool:
         """Retry sending a request to Sonarr/Radarr"""
@@ -217,28 +1553,42 @@ class OverseerrClient(APIClient):
             return False
 
 
-class SonarrClient(APIClient):
-    """Sonarr API client"""
-
-    def _get_headers(self) -> Dict[str, str]:
-        return {"X-Api-Key": self.api_key, "Content-Type": "application/json"}
+class ArrClient(APIClient):
+    """Shared library access for Sonarr/Radarr"""
 
-    def get_series(self) -> List[Dict]:
-        """Get all series in Sonarr"""
-        return self.get("/api/v3/series")  # type: ignore[return-value]
+    library_name = ""
+    library_endpoint = ""
+    media_type = MediaType.TV
+    id_field = ""
+    history_id_field = ""
+    # Snapshot fields besides id/title/id_field/monitored that _to_item reads
+    snapshot_fields: Tuple[str, ...] = ()
+    fallback_root_folder = "/media"
 
-    def has_series(self, tvdb_id: int) -> bool:
-        """Check if series exists in Sonarr by TVDB ID"""
-        series_list = self.get_series()
-        return any(s.get("tvdbId") == tvdb_id for s in series_list)
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        max_concurrency: int = 1,
+        rate_limit: float = 0,
+        name: str = "default",
+        is_4k: bool = False,
+    ):
+        self.name = name
+        self.is_4k = is_4k
+        # Index and metrics key; the default instance keeps the plain name
+        self.key = self.library_name
+        if name != "default":
+            self.key = f"{self.library_name}/{name}"
+        self.backend = self.key
+        super().__init__(base_url, api_key, max_concurrency, rate_limit)
+        # Add settings are resolved once per run and shared by every add
+        self._quality_profile_id: Optional[int] = None
+        self._root_folder: Optional[str] = None
+        self._settings_lock = threading.Lock()
 
-    def lookup_series(self, tvdb_id: int) -> Optional[Dict]:
-        """Lookup series by TVDB ID"""
-        try:
-            results = self.get(f"/api/v3/series/lookup?term=tvdb:{tvdb_id}")
-            return results[0] if results else None  # type: ignore[return-value]
-        except Exception:
-            return None
+    def _get_headers(self) -> Dict[str, str]:
+        return {"X-Api-Key": self.api_key, "Content-Type": "application/json"}
 
     def get_quality_profiles(self) -> List[Dict]:
         """Get quality profiles"""
@@ -248,69 +1598,347 @@ class SonarrClient(APIClient):
         """Get root folders"""
         return self.get("/api/v3/rootfolder")  # type: ignore[return-value]
 
-    def add_series(
-        self, tvdb_id: int, quality_profile_id: int = None, root_folder: str = None
-    ) -> bool:
-        """Add series to Sonarr"""
+    def configure(
+        self, quality_profile: Optional[str] = None, root_folder: Optional[str] = None
+    ) -> None:
+        """Pin the quality profile / root folder (by name, path or ID) for adds"""
+        with self._settings_lock:
+            if quality_profile is not None:
+                self._quality_profile_id = self._match_quality_profile(quality_profile)
+            if root_folder is not None:
+                self._root_folder = self._match_root_folder(root_folder)
+
+    def _match_quality_profile(self, wanted: str) -> int:
+        profiles = self.get_quality_profiles()
+        for profile in profiles:
+            if str(profile["id"]) == wanted or (
+                profile.get("name", "").lower() == wanted.lower()
+            ):
+                return profile["id"]
+        names = ", ".join(p.get("name", str(p["id"])) for p in profiles)
+        raise ValueError(
+            f"Unknown {self.library_name} quality profile '{wanted}' (have: {names})"
+        )
+
+    def _match_root_folder(self, wanted: str) -> str:
+        folders = self.get_root_folders()
+        for folder in folders:
+            if str(folder["id"]) == wanted or folder["path"].rstrip("/") == (
+                wanted.rstrip("/")
+            ):
+                return folder["path"]
+        paths = ", ".join(f["path"] for f in folders)
+        raise ValueError(
+            f"Unknown {self.library_name} root folder '{wanted}' (have: {paths})"
+        )
+
+    def default_quality_profile_id(self) -> int:
+        """Configured quality profile, else the first one (fetched once)"""
+        with self._settings_lock:
+            if self._quality_profile_id is None:
+                profiles = self.get_quality_profiles()
+                self._quality_profile_id = profiles[0]["id"] if profiles else 1
+            return self._quality_profile_id
+
+    def default_root_folder(self) -> str:
+        """Configured root folder, else the first one (fetched once)"""
+        with self._settings_lock:
+            if self._root_folder is None:
+                folders = self.get_root_folders()
+                self._root_folder = (
+                    folders[0]["path"] if folders else self.fallback_root_folder
+                )
+            return self._root_folder
+
+    def _to_item(self, entry: Dict) -> Optional[LibraryItem]:
+        if not entry.get(self.id_field):
+            return None
+        return LibraryItem(
+            arr_id=entry["id"],
+            external_id=entry[self.id_field],
+            title=entry.get("title") or "",
+            monitored=entry.get("monitored", True),
+            missing_files=self._missing_files(entry),
+        )
+
+    def _missing_files(self, entry: Dict) -> int:
+        """Override in subclasses"""
+        raise NotImplementedError
+
+    def get_library_items(self) -> Dict[int, LibraryItem]:
+        """Fetch the whole library, keeping only the fields we need"""
+        items = {}
+        fields = ("id", "title", self.id_field, "monitored", *self.snapshot_fields)
+        for entry in self.stream_array(self.library_endpoint, fields):
+            item = self._to_item(entry)
+            if item:
+                items[item.external_id] = item
+        return items
+
+    def get_library_item(self, arr_id: int) -> Optional[LibraryItem]:
+        """Fetch a single library entry by its Sonarr/Radarr ID, None if deleted"""
         try:
-            # Lookup series info
-            series_info = self.lookup_series(tvdb_id)
-            if not series_info:
+            return self._to_item(self.get(f"{self.library_endpoint}/{arr_id}"))
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
+
+    def find_by_external_id(self, external_id: int) -> Optional[LibraryItem]:
+        """Look up a library entry by TVDB/TMDB ID without fetching the library"""
+        try:
+            results = self.get(
+                self.library_endpoint, params={self.id_field: external_id}
+            )
+        except requests.exceptions.RequestException:
+            return None
+        for entry in results:
+            item = self._to_item(entry)  # type: ignore[arg-type]
+            if item and item.external_id == external_id:
+                return item
+        return None
+
+    def build_add_payload(
+        self,
+        external_id: int,
+        quality_profile_id: Optional[int] = None,
+        root_folder: Optional[str] = None,
+    ) -> Optional[Dict]:
+        """Override in subclasses"""
+        raise NotImplementedError
+
+    def add_item(
+        self,
+        external_id: int,
+        quality_profile_id: Optional[int] = None,
+        root_folder: Optional[str] = None,
+    ) -> Optional[LibraryItem]:
+        """Override in subclasses"""
+        raise NotImplementedError
+
+    def _created_item(self, entry: Any, external_id: int) -> LibraryItem:
+        """The library item an add returned, carrying its new Sonarr/Radarr ID"""
+        item = self._to_item(entry) if isinstance(entry, dict) else None
+        # An ID of 0 marks a placeholder, which LibraryCache doesn't persist
+        return item or LibraryItem(0, external_id, "")
+
+    def import_items(
+        self, payloads: List[Dict], batch_size: int
+    ) -> Dict[int, LibraryItem]:
+        """Add many items via the bulk import endpoint
+
+        Returns the added items by TVDB/TMDB ID. A batch the server rejects
+        as a whole is retried one item at a time, so a single bad payload only
+        fails itself.
+        """
+        added: Dict[int, LibraryItem] = {}
+        for start in range(0, len(payloads), batch_size):
+            batch = payloads[start : start + batch_size]
+            try:
+                created = self.post(f"{self.library_endpoint}/import", batch)
+            except requests.exceptions.RequestException:
                 print(
-                    f"    Could not find series info for TVDB: {tvdb_id}",
+                    f"    Bulk import of {len(batch)} {self.library_name} items "
+                    "failed, retrying individually",
                     file=sys.stderr,
                 )
-                return False
+                for payload in batch:
+                    ext_id = payload[self.id_field]
+                    try:
+                        entry = self.post(self.library_endpoint, payload)
+                    except requests.exceptions.RequestException:
+                        continue
+                    added[ext_id] = self._created_item(entry, ext_id)
+                continue
+            for entry in created:  # type: ignore[union-attr]
+                if entry.get(self.id_field):
+                    added[entry[self.id_field]] = self._created_item(
+                        entry, entry[self.id_field]
+                    )
+        return added
+
+    def search_items(
+        self, arr_ids: List[int], batch_size: int, interval: float
+    ) -> Iterator[Tuple[int, bool]]:
+        """Ask the server to search its indexers for the given library IDs
+
+        IDs go out `batch_size` at a time with `interval` seconds between
+        batches, so a long list doesn't flood the indexers. Yields each ID
+        with whether its search command was accepted, as each batch is sent.
+        """
+        for start in range(0, len(arr_ids), batch_size):
+            if start:
+                time.sleep(interval)
+            yield from self._search(arr_ids[start : start + batch_size])
+
+    def _search(self, arr_ids: List[int]) -> Iterator[Tuple[int, bool]]:
+        """Override in subclasses"""
+        raise NotImplementedError
 
-            # Auto-detect settings if not provided
-            if quality_profile_id is None:
-                profiles = self.get_quality_profiles()
-                quality_profile_id = profiles[0]["id"] if profiles else 1
+    def _command(self, body: Dict) -> bool:
+        """Queue a /api/v3/command, reporting whether it was accepted"""
+        try:
+            self.post("/api/v3/command", body)
+            return True
+        except requests.exceptions.RequestException:
+            return False
 
-            if root_folder is None:
-                folders = self.get_root_folders()
-                root_folder = folders[0]["path"] if folders else "/media"
+    def get_changed_ids_since(self, since: float) -> Set[int]:
+        """Sonarr/Radarr IDs with history events since the given timestamp"""
+        date = datetime.fromtimestamp(since, tz=timezone.utc).isoformat()
+        records = self.get("/api/v3/history/since", params={"date": date})
+        return {
+            r[self.history_id_field]
+            for r in records  # type: ignore[union-attr]
+            if r.get(self.history_id_field)
+        }
 
-            # Prepare add request
-            series_info.update(
-                {
-                    "qualityProfileId": quality_profile_id,
-                    "rootFolderPath": root_folder,
-                    "monitored": True,
-                    "addOptions": {"searchForMissingEpisodes": True},
-                }
+
+class SonarrClient(ArrClient):
+    """Sonarr API client"""
+
+    backend = library_name = "sonarr"
+    library_endpoint = "/api/v3/series"
+    media_type = MediaType.TV
+    id_field = "tvdbId"
+    history_id_field = "seriesId"
+    snapshot_fields = ("statistics", "seasons")
+
+    def lookup_series(self, tvdb_id: int) -> Optional[Dict]:
+        """Lookup series by TVDB ID"""
+        try:
+            results = self.get(f"/api/v3/series/lookup?term=tvdb:{tvdb_id}")
+            return results[0] if results else None  # type: ignore[return-value]
+        except Exception:
+            return None
+
+    def build_add_payload(
+        self,
+        tvdb_id: int,
+        quality_profile_id: Optional[int] = None,
+        root_folder: Optional[str] = None,
+    ) -> Optional[Dict]:
+        """Look up a series and prepare the body for adding it"""
+        # Lookup series info
+        series_info = self.lookup_series(tvdb_id)
+        if not series_info:
+            print(
+                f"    Could not find series info for TVDB: {tvdb_id}",
+                file=sys.stderr,
             )
+            return None
 
-            self.post("/api/v3/series", series_info)
-            return True
+        # Auto-detect settings if not provided
+        if quality_profile_id is None:
+            quality_profile_id = self.default_quality_profile_id()
+
+        if root_folder is None:
+            root_folder = self.default_root_folder()
+
+        # Prepare add request
+        series_info.update(
+            {
+                "qualityProfileId": quality_profile_id,
+                "rootFolderPath": root_folder,
+                "monitored": True,
+                "addOptions": {"searchForMissingEpisodes": True},
+            }
+        )
+        return series_info
+
+    def add_series(
+        self,
+        tvdb_id: int,
+        quality_profile_id: Optional[int] = None,
+        root_folder: Optional[str] = None,
+    ) -> Optional[LibraryItem]:
+        """Add series to Sonarr, returning it as a library item"""
+        try:
+            series_info = self.build_add_payload(
+                tvdb_id, quality_profile_id, root_folder
+            )
+            if not series_info:
+                return None
+
+            return self._created_item(self.post("/api/v3/series", series_info), tvdb_id)
         except requests.exceptions.HTTPError as e:
             if e.response is not None:
                 print(
-                    f"    Error adding series: {e.response.status_code} - {e.response.text[:200]}",
+                    f"    Error adding series: {e.response.status_code} - "
+                    f"{e.response.text[:200]}",
                     file=sys.stderr,
                 )
             else:
                 print(f"    Error adding series: {e}", file=sys.stderr)
-            return False
+            return None
         except Exception as e:
             print(f"    Error adding series: {e}", file=sys.stderr)
+            return None
+
+    def add_item(
+        self,
+        external_id: int,
+        quality_profile_id: Optional[int] = None,
+        root_folder: Optional[str] = None,
+    ) -> Optional[LibraryItem]:
+        return self.add_series(external_id, quality_profile_id, root_folder)
+
+    def _to_item(self, entry: Dict) -> Optional[LibraryItem]:
+        item = super()._to_item(entry)
+        if item:
+            item.unmonitored_seasons = tuple(
+                season["seasonNumber"]
+                for season in entry.get("seasons") or []
+                if not season.get("monitored") and not self._season_complete(season)
+            )
+        return item
+
+    @staticmethod
+    def _season_complete(season: Dict) -> bool:
+        stats = season.get("statistics") or {}
+        total = stats.get("totalEpisodeCount", 0)
+        return bool(total) and stats.get("episodeFileCount", 0) >= total
+
+    def monitor_seasons(self, series_id: int, seasons: Iterable[int]) -> bool:
+        """Monitor the given seasons with one series update
+
+        Sonarr re-monitors the seasons' episodes as part of the same update.
+        """
+        wanted = set(seasons)
+        try:
+            series = self.get(f"/api/v3/series/{series_id}")
+            for season in series.get("seasons", []):
+                if season.get("seasonNumber") in wanted:
+                    season["monitored"] = True
+            series["monitored"] = True
+            self.put(f"/api/v3/series/{series_id}", series)
+            return True
+        except requests.exceptions.RequestException:
             return False
 
+    def _missing_files(self, entry: Dict) -> int:
+        # episodeCount only counts monitored episodes that have aired
+        stats = entry.get("statistics") or {}
+        return max(0, stats.get("episodeCount", 0) - stats.get("episodeFileCount", 0))
 
-class RadarrClient(APIClient):
-    """Radarr API client"""
+    def _search(self, arr_ids: List[int]) -> Iterator[Tuple[int, bool]]:
+        # SeriesSearch takes a single seriesId, so a batch is one command
+        # per series; EpisodeSearch takes a list but would need every
+        # series' episode IDs fetched first
+        for arr_id in arr_ids:
+            yield arr_id, self._command({"name": "SeriesSearch", "seriesId": arr_id})
 
-    def _get_headers(self) -> Dict[str, str]:
-        return {"X-Api-Key": self.api_key, "Content-Type": "application/json"}
 
-    def get_movies(self) -> List[Dict]:
-        """Get all movies in Radarr"""
-        return self.get("/api/v3/movie")  # type: ignore[return-value]
+class RadarrClient(ArrClient):
+    """Radarr API client"""
 
-    def has_movie(self, tmdb_id: int) -> bool:
-        """Check if movie exists in Radarr by TMDB ID"""
-        movies = self.get_movies()
-        return any(m.get("tmdbId") == tmdb_id for m in movies)
+    backend = library_name = "radarr"
+    library_endpoint = "/api/v3/movie"
+    media_type = MediaType.MOVIE
+    id_field = "tmdbId"
+    history_id_field = "movieId"
+    snapshot_fields = ("hasFile", "isAvailable")
+    fallback_root_folder = "/movies"
 
     def lookup_movie(self, tmdb_id: int) -> Optional[Dict]:
         """Lookup movie by TMDB ID"""
@@ -320,266 +1948,1297 @@ class RadarrClient(APIClient):
         except Exception:
             return None
 
-    def get_quality_profiles(self) -> List[Dict]:
-        """Get quality profiles"""
-        return self.get("/api/v3/qualityprofile")  # type: ignore[return-value]
+    def build_add_payload(
+        self,
+        tmdb_id: int,
+        quality_profile_id: Optional[int] = None,
+        root_folder: Optional[str] = None,
+    ) -> Optional[Dict]:
+        """Look up a movie and prepare the body for adding it"""
+        # Lookup movie info
+        movie_info = self.lookup_movie(tmdb_id)
+        if not movie_info:
+            print(
+                f"    Could not find movie info for TMDB: {tmdb_id}",
+                file=sys.stderr,
+            )
+            return None
 
-    def get_root_folders(self) -> List[Dict]:
-        """Get root folders"""
-        return self.get("/api/v3/rootfolder")  # type: ignore[return-value]
+        # Auto-detect settings if not provided
+        if quality_profile_id is None:
+            quality_profile_id = self.default_quality_profile_id()
+
+        if root_folder is None:
+            root_folder = self.default_root_folder()
+
+        # Prepare add request with required fields
+        add_data = {
+            "title": movie_info.get("title"),
+            "year": movie_info.get("year"),
+            "tmdbId": movie_info.get("tmdbId"),
+            "qualityProfileId": quality_profile_id,
+            "rootFolderPath": root_folder,
+            "monitored": True,
+            "addOptions": {"searchForMovie": True},
+        }
+
+        # Include optional fields if present
+        if "images" in movie_info:
+            add_data["images"] = movie_info["images"]
+        if "titleSlug" in movie_info:
+            add_data["titleSlug"] = movie_info["titleSlug"]
+        return add_data
 
     def add_movie(
-        self, tmdb_id: int, quality_profile_id: int = None, root_folder: str = None
-    ) -> bool:
-        """Add movie to Radarr"""
+        self,
+        tmdb_id: int,
+        quality_profile_id: Optional[int] = None,
+        root_folder: Optional[str] = None,
+    ) -> Optional[LibraryItem]:
+        """Add movie to Radarr, returning it as a library item"""
         try:
-            # Lookup movie info
-            movie_info = self.lookup_movie(tmdb_id)
-            if not movie_info:
+            add_data = self.build_add_payload(tmdb_id, quality_profile_id, root_folder)
+            if not add_data:
+                return None
+
+            return self._created_item(self.post("/api/v3/movie", add_data), tmdb_id)
+        except requests.exceptions.HTTPError as e:
+            if e.response is not None:
                 print(
-                    f"    Could not find movie info for TMDB: {tmdb_id}",
+                    f"    Error adding movie: {e.response.status_code} - "
+                    f"{e.response.text[:200]}",
                     file=sys.stderr,
                 )
+            else:
+                print(f"    Error adding movie: {e}", file=sys.stderr)
+            return None
+        except Exception as e:
+            print(f"    Error adding movie: {e}", file=sys.stderr)
+            return None
+
+    def add_item(
+        self,
+        external_id: int,
+        quality_profile_id: Optional[int] = None,
+        root_folder: Optional[str] = None,
+    ) -> Optional[LibraryItem]:
+        return self.add_movie(external_id, quality_profile_id, root_folder)
+
+    def _missing_files(self, entry: Dict) -> int:
+        # Unreleased movies have nothing to find yet
+        return int(not entry.get("hasFile") and entry.get("isAvailable", True))
+
+    def _search(self, arr_ids: List[int]) -> Iterator[Tuple[int, bool]]:
+        accepted = self._command({"name": "MoviesSearch", "movieIds": arr_ids})
+        for arr_id in arr_ids:
+            yield arr_id, accepted
+
+
+class WebhookQueue:
+    """Bounded, debounced queue of Overseerr request IDs
+
+    Repeat notifications for an ID that is still waiting push its deadline
+    back instead of queueing it twice, so a burst of events for the same
+    request is reconciled once.
+    """
+
+    def __init__(self, max_size: int, debounce: float):
+        self.max_size = max_size
+        self.debounce = debounce
+        self._due: Dict[int, float] = {}
+        self._cond = threading.Condition()
+
+    def submit(self, request_id: int) -> bool:
+        """Queue (or re-debounce) a request; False if the queue is full"""
+        with self._cond:
+            if request_id not in self._due and len(self._due) >= self.max_size:
                 return False
+            self._due[request_id] = time.monotonic() + self.debounce
+            self._cond.notify()
+            return True
 
-            # Auto-detect settings if not provided
-            if quality_profile_id is None:
-                profiles = self.get_quality_profiles()
-                quality_profile_id = profiles[0]["id"] if profiles else 1
+    def get(self, stop: threading.Event) -> Optional[int]:
+        """Block until a request's debounce window has passed, or stop is set"""
+        with self._cond:
+            while not stop.is_set():
+                if self._due:
+                    request_id, due = min(self._due.items(), key=lambda kv: kv[1])
+                    wait = due - time.monotonic()
+                    if wait <= 0:
+                        del self._due[request_id]
+                        return request_id
+                else:
+                    wait = 1.0
+                self._cond.wait(timeout=min(wait, 1.0))
+        return None
 
-            if root_folder is None:
-                folders = self.get_root_folders()
-                root_folder = folders[0]["path"] if folders else "/movies"
 
-            # Prepare add request with required fields
-            add_data = {
-                "title": movie_info.get("title"),
-                "year": movie_info.get("year"),
-                "tmdbId": movie_info.get("tmdbId"),
-                "qualityProfileId": quality_profile_id,
-                "rootFolderPath": root_folder,
-                "monitored": True,
-                "addOptions": {"searchForMovie": True},
-            }
+class WebhookServer(ThreadingHTTPServer):
+    """HTTP server carrying the queue and shared secret for WebhookHandler"""
+
+    daemon_threads = True
+    queue: WebhookQueue
+    secret: Optional[str] = None
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    """Serves /metrics and /healthz"""
+
+    def do_GET(self):
+        path = self.path.rstrip("/")
+        if path == "/healthz":
+            self._send(200, "ok\n")
+        elif path == "/metrics":
+            self._send(200, METRICS.render(), "text/plain; version=0.0.4")
+        else:
+            self._send(404, "not found\n")
+
+    def _send(self, code, body, content_type="text/plain"):
+        data = body.encode()
+        self.send_response(code)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):  # silence per-request logging
+        pass
+
+
+class WebhookHandler(MetricsHandler):
+    """Accepts Overseerr webhook notifications and queues approved requests"""
+
+    server: WebhookServer
+    TRIGGERS = ("MEDIA_APPROVED", "MEDIA_AUTO_APPROVED")
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/webhook":
+            self._send(404, "not found\n")
+            return
+        # Bytes, since compare_digest rejects non-ASCII strings
+        if self.server.secret and not hmac.compare_digest(
+            self.headers.get("Authorization", "").encode(),
+            self.server.secret.encode(),
+        ):
+            self._send(401, "unauthorized\n")
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(400, "invalid json\n")
+            return
+
+        notification = payload.get("notification_type", "")
+        if notification not in self.TRIGGERS:
+            self._send(204, "")
+            return
 
-            # Include optional fields if present
-            if "images" in movie_info:
-                add_data["images"] = movie_info["images"]
-            if "titleSlug" in movie_info:
-                add_data["titleSlug"] = movie_info["titleSlug"]
+        try:
+            request_id = int((payload.get("request") or {})["request_id"])
+        except (KeyError, TypeError, ValueError):
+            self._send(400, "missing request.request_id\n")
+            return
 
-            self.post("/api/v3/movie", add_data)
-            return True
-        except requests.exceptions.HTTPError as e:
-            if e.response is not None:
-                print(
-                    f"    Error adding movie: {e.response.status_code} - {e.response.text[:200]}",
-                    file=sys.stderr,
-                )
-            else:
-                print(f"    Error adding movie: {e}", file=sys.stderr)
-            return False
-        except Exception as e:
-            print(f"    Error adding movie: {e}", file=sys.stderr)
-            return False
+        if self.server.queue.submit(request_id):
+            self._send(202, "queued\n")
+        else:
+            self._send(503, "queue full\n")
 
 
 class ReconciliationService:
     """Service to reconcile Overseerr requests with Sonarr/Radarr"""
 
-    def __init__(self, config: Config):
-        self.overseerr = OverseerrClient(config.overseerr_url, config.overseerr_api_key)
-        self.sonarr = SonarrClient(config.sonarr_url, config.sonarr_api_key)
-        self.radarr = RadarrClient(config.radarr_url, config.radarr_api_key)
+    def __init__(
+        self,
+        config: Config,
+        concurrency: Optional[Dict[str, int]] = None,
+        cache: Optional[LibraryCache] = None,
+        titles: Optional[TitleCache] = None,
+        page_size: int = 50,
+        rate_limits: Optional[Dict[str, float]] = None,
+        reporter: Optional[Reporter] = None,
+        journal: Optional[Journal] = None,
+    ):
+        concurrency = concurrency or {}
+        rate_limits = rate_limits or {}
+        self.page_size = page_size
+        self.reporter = reporter or ConsoleReporter()
+        self.journal = journal
+        self.cache = cache
+        self.titles = titles or TitleCache()
+        self.overseerr = OverseerrClient(
+            config.overseerr_url,
+            config.overseerr_api_key,
+            concurrency.get("overseerr", 1),
+            rate_limits.get("overseerr", 0),
+        )
+        # Every configured instance, with the config it came from
+        self._instances: List[Tuple[ArrClient, ArrInstance]] = []
+        client_types: Tuple[Tuple[Type[ArrClient], List[ArrInstance]], ...] = (
+            (SonarrClient, config.sonarr),
+            (RadarrClient, config.radarr),
+        )
+        for client_type, instances in client_types:
+            backend = client_type.library_name
+            for instance in instances:
+                client = client_type(
+                    instance.url,
+                    instance.api_key,
+                    concurrency.get(backend, 1),
+                    rate_limits.get(backend, 0),
+                    name=instance.name,
+                    is_4k=instance.is_4k,
+                )
+                self._instances.append((client, instance))
+        self.arr_clients: List[ArrClient] = [c for c, _ in self._instances]
+        self.sonarrs = [c for c in self.arr_clients if c.media_type == MediaType.TV]
+        self.radarrs = [c for c in self.arr_clients if c.media_type != MediaType.TV]
+        self.index = LibraryIndex()
+        self._index_dirty = False
+        # Coalesces webhook/watch work on the same item; one-shot passes use
+        # their own SingleFlight that also remembers finished items
+        self._inflight = SingleFlight()
+        # Long-running modes check requests the moment Overseerr has sent
+        # them on, which an hour-old index can't have seen yet
+        self.always_verify_misses = False
+
+    @property
+    def max_workers(self) -> int:
+        """Worker threads needed to saturate every backend's concurrency cap"""
+        return self.overseerr.max_concurrency + sum(
+            c.max_concurrency for c in self.arr_clients
+        )
+
+    def configure_clients(
+        self,
+        media_type: Optional[MediaType],
+        defaults: Dict[str, Tuple[Optional[str], Optional[str]]],
+    ) -> None:
+        """Resolve each instance's quality profile and root folder up front
+
+        An instance's own settings win over `defaults`, which maps a backend
+        name to the (profile, root folder) given on the command line.
+        """
+        for client, instance in self._instances:
+            if media_type not in (None, client.media_type):
+                continue
+            profile, root = defaults.get(client.library_name, (None, None))
+            client.configure(
+                instance.quality_profile or profile, instance.root_folder or root
+            )
+
+    def _clients_for(self, req: OverseerrRequest) -> List[ArrClient]:
+        """Instances that serve a request, matched on its 4K flag
+
+        The first one is where missing items get added. If no instance has
+        the right 4K flag, every instance of the backend is used.
+        """
+        pool = self.radarrs if req.media_type == MediaType.MOVIE else self.sonarrs
+        return [c for c in pool if c.is_4k == req.is_4k] or pool
+
+    def load_library_index(
+        self, media_type: Optional[MediaType] = None, refresh: bool = False
+    ) -> None:
+        """Snapshot the Sonarr/Radarr libraries once for the whole run
+
+        Every instance is a separate server, so they are all fetched at once.
+        """
+        self.reporter.info("📚 Building library index from Sonarr/Radarr...")
+        clients = [c for c in self.arr_clients if media_type in (None, c.media_type)]
+        with ThreadPoolExecutor(max_workers=max(1, len(clients))) as pool:
+            snapshots = list(
+                pool.map(lambda c: self._load_library(c, refresh), clients)
+            )
+
+        index = LibraryIndex(verify_misses=self.always_verify_misses)
+        for client, (items, cached, messages) in zip(clients, snapshots):
+            # Logged here, in client order, rather than from the pool
+            for message in messages:
+                self.reporter.info(message)
+            index.libraries[client.key] = items
+            index.verify_misses |= cached
+        self.index = index
+        METRICS.index = index
+
+        series = sum(
+            len(index.libraries[c.key]) for c in clients if c.media_type == MediaType.TV
+        )
+        movies = sum(
+            len(index.libraries[c.key])
+            for c in clients
+            if c.media_type == MediaType.MOVIE
+        )
+        where = f" from {len(clients)} instances" if len(clients) > 2 else ""
+        self.reporter.info(f"📚 Indexed {series} series and {movies} movies{where}")
+
+    def _load_library(
+        self, client: ArrClient, refresh: bool
+    ) -> Tuple[Dict[int, LibraryItem], bool, List[str]]:
+        """(items, served_from_cache, progress messages) for one library"""
+        messages: List[str] = []
+        with PROFILER.phase("library"):
+            if self.cache is None:
+                return client.get_library_items(), False, messages
+            items, cached = self.cache.load(
+                client, force_full=refresh, log=messages.append
+            )
+        return items, cached, messages
+
+    def _in_library(self, req: OverseerrRequest) -> bool:
+        """Check the index, confirming cache misses against the backend
+
+        Requests Overseerr has already linked to a Sonarr/Radarr entry are
+        confirmed by that entry's ID alone; only unlinked requests, or links
+        to entries that are gone, go on to the external ID match and, for a
+        cached index, a lookup against the backend.
+        """
+        ext_id = external_id(req)
+        clients = self._clients_for(req)
+        if self._linked_item(req, clients):
+            METRICS.inc("prefilter_total", result="linked")
+            return True
+        METRICS.inc("prefilter_total", result="unlinked")
+        if any(self.index.has(c.key, ext_id) for c in clients):
+            return True
+        if self.index.verify_misses:
+            with PROFILER.phase("check"):
+                for client in clients:
+                    item = client.find_by_external_id(ext_id)
+                    if item:
+                        self._record_added(client, item)
+                        return True
+        return False
+
+    def _linked_item(
+        self, req: OverseerrRequest, clients: List[ArrClient]
+    ) -> Optional[Tuple[ArrClient, LibraryItem]]:
+        """The indexed entry Overseerr's externalServiceId points at, if any
+
+        Series/movie IDs are only unique within one server, so with several
+        candidate instances the entry's TVDB/TMDB ID has to agree as well.
+        """
+        if not req.external_service_id:
+            return None
+        for client in clients:
+            item = self.index.by_arr_id(client.key, req.external_service_id)
+            if item and (len(clients) == 1 or item.external_id == external_id(req)):
+                return client, item
+        return None
+
+    def _indexed_item(
+        self, req: OverseerrRequest
+    ) -> Optional[Tuple[ArrClient, LibraryItem]]:
+        """The indexed entry for a request, by Overseerr's link or external ID"""
+        clients = self._clients_for(req)
+        found = self._linked_item(req, clients)
+        if found:
+            return found
+        ext_id = external_id(req)
+        for client in clients:
+            item = self.index.libraries.get(client.key, {}).get(ext_id)
+            if item:
+                return client, item
+        return None
+
+    def _record_added(self, client: ArrClient, item: LibraryItem) -> None:
+        """Add an item to the in-memory index and remember to persist it"""
+        self.index.add(client.key, item)
+        self._index_dirty = True
+
+    def save_library_cache(self) -> None:
+        """Persist items discovered or added during this run"""
+        if self.cache is None or not self._index_dirty:
+            return
+        for client in self.arr_clients:
+            items = self.index.libraries.get(client.key)
+            if items:
+                self.cache.update(client, items)
+        self._index_dirty = False
 
     def find_missing_requests(
         self,
         media_type: Optional[MediaType] = None,
         debug: bool = False,
         sync_mode: bool = False,
+        refresh_cache: bool = False,
+        batch_size: int = 0,
+        resume: bool = False,
+        monitor_seasons: bool = False,
+        finalize: bool = True,
     ) -> List[OverseerrRequest]:
-        """Find approved requests missing from Sonarr/Radarr"""
-        print("🔍 Fetching approved requests from Overseerr...")
-        requests = self.overseerr.get_requests(
-            status=RequestStatus.APPROVED, debug=debug
+        """Find approved requests missing from Sonarr/Radarr
+
+        In sync mode items are added as they are found, or - with a
+        batch_size - collected and submitted through the bulk import
+        endpoints once the check pass is complete. With a journal, each
+        result is logged as it is reported; `resume` skips requests an
+        interrupted run already finished.
+
+        Series that are present but have requested seasons unmonitored are
+        season gaps, not missing requests: they are monitored in sync mode
+        (or with `monitor_seasons`) and otherwise only reported. Without
+        `finalize` the run is left open for a caller that has more to do.
+        """
+        skip: Set[int] = set()
+        if self.journal:
+            skip = self.journal.open(resume)
+            if skip:
+                self.reporter.info(
+                    f"⏭️  Resuming: skipping {len(skip)} requests "
+                    "finished by the previous run"
+                )
+
+        self.reporter.info("🔍 Fetching approved requests from Overseerr...")
+        total, requests = self.overseerr.stream_requests(
+            status=RequestStatus.APPROVED,
+            media_type=media_type,
+            debug=debug,
+            page_size=self.page_size,
         )
 
-        if media_type:
-            requests = [r for r in requests if r.media_type == media_type]
+        self.reporter.info(f"📋 Found {total} approved requests")
 
-        print(f"📋 Found {len(requests)} approved requests")
+        self.load_library_index(media_type, refresh=refresh_cache)
+        if skip:
+            requests = (r for r in requests if r.id not in skip)
+            total = max(0, total - len(skip))
 
         missing = []
+        queued: List[ReconcileResult] = []
+        gaps: List[ReconcileResult] = []
         success_count = 0
         fail_count = 0
+        add_now = sync_mode and not batch_size
+        # Several requests (per season, per user) often point at the same
+        # show: check and add it once and give every request the result
+        flights = SingleFlight(remember=True)
+
+        mode_text = "Checking and adding" if add_now else "Checking"
+        self.reporter.info(
+            f"\n🔎 {mode_text} {total} requests against Sonarr/Radarr..."
+        )
 
-        mode_text = "Checking and adding" if sync_mode else "Checking"
-        print(f"\n🔎 {mode_text} {len(requests)} requests against Sonarr/Radarr...")
+        # Requests stream in while later pages are still downloading. Workers
+        # run the lookup/title/add steps concurrently, but results are
+        # consumed in request order so the console output stays deterministic
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            results = ordered_map(
+                executor,
+                lambda req: self._reconcile_request(req, add_now, flights),
+                requests,
+                window=self.max_workers * 2,
+            )
 
-        for i, req in enumerate(requests, 1):
-            if i % 20 == 0:
-                print(
-                    f"  Progress: {i}/{len(requests)}..."
-                    + (
-                        f" ({success_count} added, {fail_count} failed)"
-                        if sync_mode
-                        else ""
+            for i, result in enumerate(results, 1):
+                if i % 20 == 0:
+                    self.reporter.info(
+                        f"  Progress: {i}/{total}..."
+                        + (
+                            f" ({success_count} added, {fail_count} failed)"
+                            if add_now
+                            else ""
+                        )
                     )
-                )
 
-            if req.media_type == MediaType.MOVIE:
-                if not self.radarr.has_movie(req.tmdb_id):
-                    title = self._get_media_title(
-                        req.media_type, req.tmdb_id, req.title
-                    )
+                if sync_mode and result.outcome == Outcome.MISSING:
+                    queued.append(result)
+                    continue
+                if result.outcome == Outcome.UNMONITORED_SEASONS:
+                    gaps.append(result)
+                    if not (sync_mode or monitor_seasons):
+                        self._report(result)
+                    continue
 
-                    if sync_mode:
-                        # Add immediately
-                        print(f"  📤 Adding movie: {title}...", end=" ", flush=True)
-                        if self.radarr.add_movie(req.tmdb_id):
-                            print("✅")
-                            success_count += 1
-                        else:
-                            print("❌")
-                            fail_count += 1
-                            missing.append(req)  # Track failures
-                    else:
-                        # Just report
-                        missing.append(req)
-                        print(
-                            f"  ❌ Movie missing: {title} (TMDB: {req.tmdb_id}, Requested: {req.created_at[:10]})"
-                        )
+                self._report(result)
 
-            elif req.media_type == MediaType.TV:
-                if req.tvdb_id and not self.sonarr.has_series(req.tvdb_id):
-                    title = self._get_media_title(
-                        req.media_type, req.tvdb_id, req.title, use_tvdb=True
-                    )
+                # Duplicates share another request's add; count it once
+                if result.outcome == Outcome.ADDED:
+                    success_count += not result.covered_by
+                elif result.outcome == Outcome.FAILED:
+                    fail_count += not result.covered_by
+                    missing.append(result.request)  # Track failures
+                elif result.outcome == Outcome.MISSING:
+                    missing.append(result.request)
+
+        if queued:
+            self.reporter.info(
+                f"\n📦 Adding {len(queued)} missing items in batches of {batch_size}..."
+            )
+            for result in self._add_batched(queued, batch_size):
+                self._report(result)
+                if result.outcome == Outcome.ADDED:
+                    success_count += not result.covered_by
+                else:
+                    fail_count += not result.covered_by
+                    missing.append(result.request)
 
+        monitored = 0
+        if gaps and (sync_mode or monitor_seasons):
+            self.reporter.info(
+                f"\n📺 Monitoring requested seasons for {len(gaps)} request(s)..."
+            )
+            for result in self._monitor_seasons(gaps):
+                self._report(result)
+                if result.outcome == Outcome.MONITORED_SEASONS:
+                    monitored += 1
+                else:
+                    fail_count += 1
                     if sync_mode:
-                        # Add immediately
-                        print(f"  📤 Adding TV show: {title}...", end=" ", flush=True)
-                        if self.sonarr.add_series(req.tvdb_id):
-                            print("✅")
-                            success_count += 1
-                        else:
-                            print("❌")
-                            fail_count += 1
-                            missing.append(req)  # Track failures
-                    else:
-                        # Just report
-                        missing.append(req)
-                        print(
-                            f"  ❌ TV show missing: {title} (TVDB: {req.tvdb_id}, Requested: {req.created_at[:10]})"
-                        )
-                elif not req.tvdb_id and not sync_mode:
-                    print(f"  ⚠️  No TVDB ID for: {req.title} - cannot verify")
+                        missing.append(result.request)
+        elif gaps:
+            self.reporter.info(
+                f"\n📺 {len(gaps)} request(s) in the library with requested "
+                "seasons unmonitored"
+            )
+
+        if flights.shared:
+            self.reporter.info(
+                f"🔗 {flights.shared} lookup(s) coalesced with another request "
+                "for the same item"
+            )
+
+        self.save_library_cache()
+        self.titles.save()
+        if finalize:
+            self._finish_run()
 
         if sync_mode:
-            print(f"\n✅ Sync complete: {success_count} added, {fail_count} failed")
+            self.reporter.info(
+                f"\n✅ Sync complete: {success_count} added, "
+                f"{monitored} with seasons monitored, {fail_count} failed"
+            )
 
         return missing
 
-    def _get_media_title(
-        self,
-        media_type: MediaType,
-        media_id: int,
-        fallback: str,
-        use_tvdb: bool = False,
-    ) -> str:
-        """Fetch media title from Overseerr"""
+    def diff(self, media_type: Optional[MediaType] = None) -> Dict[str, List[Dict]]:
+        """Three-way comparison of Overseerr requests and the libraries
+
+        Takes one snapshot of each system and compares ID sets in a single
+        pass, with no per-item API calls. Groups:
+
+          missing        approved/failed requests not in a matching library
+          no_tvdb        TV requests without a TVDB ID, which can't be matched
+          not_available  requests whose media is in the library but which
+                         Overseerr shows as less than partially available
+          orphans        library items that no (non-declined) request covers
+        """
+        self.reporter.info("🔍 Fetching all requests from Overseerr...")
+        total, requests = self.overseerr.stream_requests(
+            media_type=media_type, page_size=self.page_size
+        )
+        # A cached snapshot would need per-item confirmation of every miss
+        self.load_library_index(media_type, refresh=True)
+        self.reporter.info(f"🔎 Comparing {total} requests with the libraries...")
+
+        groups: Dict[str, List[Dict]] = {
+            "missing": [],
+            "no_tvdb": [],
+            "not_available": [],
+            "orphans": [],
+        }
+        wanted = (RequestStatus.APPROVED.value, RequestStatus.FAILED.value)
+        claimed: Set[Tuple[str, int]] = set()
+        for req in requests:
+            if req.status == RequestStatus.DECLINED.value:
+                continue
+            ext_id = external_id(req)
+            if not ext_id:
+                if req.status in wanted:
+                    groups["no_tvdb"].append(self._diff_record(req))
+                continue
+
+            found = None
+            for client in self._clients_for(req):
+                claimed.add((client.key, ext_id))
+                item = self.index.libraries.get(client.key, {}).get(ext_id)
+                if item and found is None:
+                    found = (client, item)
+
+            if found is None:
+                if req.status in wanted:
+                    groups["missing"].append(self._diff_record(req))
+            elif req.media_status < MediaStatus.PARTIALLY_AVAILABLE.value:
+                client, item = found
+                record = self._diff_record(req)
+                record.update(instance=client.key, arr_id=item.arr_id)
+                groups["not_available"].append(record)
+
+        for library, items in self.index.libraries.items():
+            for ext_id, item in items.items():
+                if (library, ext_id) not in claimed:
+                    groups["orphans"].append(
+                        {
+                            "instance": library,
+                            "arr_id": item.arr_id,
+                            "external_id": ext_id,
+                            "title": item.title,
+                        }
+                    )
+
+        for category, entries in groups.items():
+            METRICS.set("diff_items", len(entries), category=category)
+        return groups
+
+    @staticmethod
+    def _diff_record(req: OverseerrRequest) -> Dict:
         try:
-            endpoint = (
-                f"/api/v1/{'tv' if media_type == MediaType.TV else 'movie'}/{media_id}"
+            status = RequestStatus(req.status).name.lower()
+        except ValueError:
+            status = str(req.status)
+        return {
+            "request_id": req.id,
+            "media_type": req.media_type.value,
+            "title": req.title if req.has_title else None,
+            "tmdb_id": req.tmdb_id,
+            "tvdb_id": req.tvdb_id,
+            "is_4k": req.is_4k,
+            "status": status,
+            "media_status": req.media_status,
+            "requested_by": req.requested_by,
+            "created_at": req.created_at,
+        }
+
+    def find_missing_files(
+        self,
+        media_type: Optional[MediaType] = None,
+        search: bool = False,
+        batch_size: int = 10,
+        interval: float = 60,
+    ) -> List[OverseerrRequest]:
+        """Find requested, monitored library items that were never downloaded
+
+        Works from one snapshot of each library (hasFile for movies, episode
+        statistics for series) with no per-title calls. With `search`, each
+        such item gets one search command through /api/v3/command, paced by
+        ArrClient.search_items. Returns the requests still without files.
+        """
+        self.reporter.info("🔍 Fetching requests from Overseerr...")
+        total, requests = self.overseerr.stream_requests(
+            media_type=media_type, page_size=self.page_size
+        )
+        # Files arrive without new library entries, so a cached snapshot
+        # would be stale exactly where it matters
+        self.load_library_index(media_type, refresh=True)
+
+        wanted = (
+            RequestStatus.APPROVED.value,
+            RequestStatus.FAILED.value,
+            RequestStatus.COMPLETED.value,
+        )
+        # Every request for an item, so the item is searched once
+        found: Dict[Tuple[str, int], List[OverseerrRequest]] = {}
+        items: Dict[Tuple[str, int], LibraryItem] = {}
+        for req in requests:
+            if req.status not in wanted:
+                continue
+            located = self._indexed_item(req)
+            if located is None:
+                continue
+            client, item = located
+            if item.monitored and item.missing_files:
+                key = (client.key, item.arr_id)
+                found.setdefault(key, []).append(req)
+                items[key] = item
+
+        self.reporter.info(
+            f"📭 {len(items)} requested item(s) without files (from {total} requests)"
+        )
+
+        missing: List[OverseerrRequest] = []
+
+        def report(key: Tuple[str, int], outcome: Outcome) -> None:
+            for req in found[key]:
+                self._report(ReconcileResult(req, outcome, items[key].title))
+                if outcome != Outcome.SEARCHED:
+                    missing.append(req)
+
+        if not search:
+            for key in sorted(found, key=lambda k: items[k].title):
+                report(key, Outcome.NO_FILES)
+            return missing
+
+        for client in self.arr_clients:
+            arr_ids = sorted(arr_id for key, arr_id in found if key == client.key)
+            if not arr_ids:
+                continue
+            self.reporter.info(
+                f"\n🔎 Searching {len(arr_ids)} {client.key} item(s), "
+                f"{batch_size} every {interval:g}s..."
             )
-            data = self.overseerr.get(endpoint)
-            return data.get("title") or data.get("name") or fallback
-        except Exception:
-            return fallback
+            with PROFILER.phase("search"):
+                for arr_id, accepted in client.search_items(
+                    arr_ids, batch_size, interval
+                ):
+                    report(
+                        (client.key, arr_id),
+                        Outcome.SEARCHED if accepted else Outcome.NO_FILES,
+                    )
+        return missing
 
-    def sync_missing_requests(
+    def retry_via_overseerr(
         self,
-        missing_requests: List[OverseerrRequest],
-        sonarr_quality_profile: int = None,
-        radarr_quality_profile: int = None,
-        sonarr_root: str = None,
-        radarr_root: str = None,
-    ) -> int:
-        """Add missing requests directly to Sonarr/Radarr"""
-        if not missing_requests:
-            print("✅ No missing requests to sync!")
-            return 0
+        media_type: Optional[MediaType] = None,
+        debug: bool = False,
+        refresh_cache: bool = False,
+        resume: bool = False,
+    ) -> List[OverseerrRequest]:
+        """Have Overseerr re-send missing and failed requests, then re-verify
+
+        Unlike adding items directly, this keeps Overseerr's own server,
+        quality profile and root folder choices. Retries run concurrently up
+        to the Overseerr concurrency cap, then a single fresh library
+        snapshot shows which of them arrived. Returns those still missing.
+        """
+        # Season gaps are monitored directly: re-sending the request to
+        # Overseerr wouldn't change Sonarr's season monitoring
+        missing = self.find_missing_requests(
+            media_type,
+            debug=debug,
+            refresh_cache=refresh_cache,
+            resume=resume,
+            monitor_seasons=True,
+            finalize=False,
+        )
+
+        # Requests Overseerr itself gave up on, unless they made it anyway
+        _, failed = self.overseerr.stream_requests(
+            status=RequestStatus.FAILED,
+            media_type=media_type,
+            page_size=self.page_size,
+        )
+        retry = {r.id: r for r in missing}
+        for req in failed:
+            if external_id(req) and not self._in_library(req):
+                retry.setdefault(req.id, req)
+        if not retry:
+            self._finish_run()
+            return []
+
+        # Retry each item once, through the first request for it
+        items: Dict[Tuple[MediaType, int, str], List[OverseerrRequest]] = {}
+        for req in retry.values():
+            items.setdefault(self._item_key(req), []).append(req)
+
+        self.reporter.info(
+            f"\n🔁 Asking Overseerr to retry {len(items)} item(s) for "
+            f"{len(retry)} request(s) ({len(retry) - len(missing)} marked failed)..."
+        )
+
+        def send(key: Tuple[MediaType, int, str]) -> bool:
+            with PROFILER.phase("retry"):
+                return self.overseerr.retry_request(items[key][0].id)
+
+        with ThreadPoolExecutor(max_workers=self.overseerr.max_concurrency) as pool:
+            sent = dict(zip(items, pool.map(send, items)))
 
-        print(
-            f"\n🔄 Adding {len(missing_requests)} missing items directly to Sonarr/Radarr..."
+        self.reporter.info(
+            "🔎 Re-checking retried requests against a fresh snapshot..."
         )
+        self.load_library_index(media_type, refresh=True)
+
+        still_missing = []
+        for key, reqs in items.items():
+            arrived = sent[key] and self._in_library(reqs[0])
+            outcome = Outcome.ADDED if arrived else Outcome.FAILED
+            for req in reqs:
+                covered_by = reqs[0].id if req is not reqs[0] else None
+                title = self._get_media_title(req)
+                self._report(
+                    ReconcileResult(req, outcome, title, covered_by=covered_by)
+                )
+                if not arrived:
+                    still_missing.append(req)
 
-        success_count = 0
-        for req in missing_requests:
-            title = self._get_media_title(
-                req.media_type,
-                req.tmdb_id if req.media_type == MediaType.MOVIE else req.tvdb_id,
-                req.title,
-            )
-            print(f"  📤 Adding: {title}...", end=" ")
+        self.save_library_cache()
+        self.titles.save()
+        self._finish_run()
+        return still_missing
 
+    def watch(
+        self,
+        interval: float,
+        index_refresh: float,
+        media_type: Optional[MediaType] = None,
+        sync_mode: bool = False,
+        stop: Optional[threading.Event] = None,
+    ) -> None:
+        """Reconcile new/changed requests every `interval` seconds until stopped
+
+        Starts with one full pass, then only looks at requests whose
+        updatedAt is at or past the newest one already processed. The
+        library index is refreshed separately every `index_refresh` seconds.
+        """
+        stop = stop or threading.Event()
+        self.always_verify_misses = True
+
+        # Take the cursor before the full pass so nothing modified while it
+        # runs is skipped
+        cursor = self.overseerr.get_latest_update()
+        seen_at_cursor = {
+            r.id
+            for r in self.overseerr.get_requests_since(cursor, self.page_size)
+            if r.updated_at == cursor
+        }
+        self.find_missing_requests(media_type, sync_mode=sync_mode)
+
+        self.reporter.info(
+            f"\n👀 Watching for new or changed requests every {interval:g}s..."
+        )
+        # Consecutive failed cycles; each one doubles the wait, up to 8x
+        failures = 0
+        while not stop.wait(interval * 2 ** min(failures, 3)):
             try:
-                if req.media_type == MediaType.MOVIE:
-                    if self.radarr.add_movie(
-                        req.tmdb_id, radarr_quality_profile, radarr_root
-                    ):
-                        print("✅")
-                        success_count += 1
-                    else:
-                        print("❌")
-                elif req.media_type == MediaType.TV and req.tvdb_id:
-                    if self.sonarr.add_series(
-                        req.tvdb_id, sonarr_quality_profile, sonarr_root
+                if time.time() - self.index.loaded_at >= index_refresh:
+                    self.load_library_index(media_type)
+
+                changed = [
+                    r
+                    for r in self.overseerr.get_requests_since(cursor, self.page_size)
+                    if not (r.updated_at == cursor and r.id in seen_at_cursor)
+                ]
+                if not changed:
+                    failures = 0
+                    continue
+
+                newest = max(r.updated_at for r in changed)
+                if newest != cursor:
+                    cursor, seen_at_cursor = newest, set()
+                seen_at_cursor.update(r.id for r in changed if r.updated_at == cursor)
+
+                todo = [
+                    r
+                    for r in changed
+                    if r.status == RequestStatus.APPROVED.value
+                    and media_type in (None, r.media_type)
+                ]
+                stamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                self.reporter.info(
+                    f"[{stamp}] 🔁 {len(changed)} changed request(s), "
+                    f"{len(todo)} approved to check"
+                )
+                gaps = []
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    for result in ordered_map(
+                        executor,
+                        lambda req: self._reconcile_request(req, sync_mode),
+                        todo,
+                        window=self.max_workers * 2,
                     ):
-                        print("✅")
-                        success_count += 1
-                    else:
-                        print("❌")
-                else:
-                    print("⚠️  No TVDB ID")
+                        if sync_mode and result.outcome == Outcome.UNMONITORED_SEASONS:
+                            gaps.append(result)
+                        else:
+                            self._report(result)
+                for result in self._monitor_seasons(gaps):
+                    self._report(result)
+
+                self.save_library_cache()
+                self.titles.save()
+                METRICS.set("last_run_timestamp_seconds", time.time())
+                failures = 0
             except Exception as e:
-                print(f"❌ ({e})")
+                # A bad page or a full disk shouldn't stop the daemon
+                failures += 1
+                METRICS.inc("watch_errors_total", error=type(e).__name__)
+                print(
+                    f"  ⚠️  Watch cycle failed ({type(e).__name__}: {e}), next "
+                    f"try in {interval * 2 ** min(failures, 3):g}s",
+                    file=sys.stderr,
+                )
+
+        self.reporter.info("👋 Watch stopped")
+
+    def serve(
+        self,
+        port: int,
+        index_refresh: float,
+        media_type: Optional[MediaType] = None,
+        sync_mode: bool = False,
+        secret: Optional[str] = None,
+        debounce: float = 5,
+        queue_size: int = 100,
+        stop: Optional[threading.Event] = None,
+    ) -> None:
+        """Reconcile single requests as Overseerr webhook notifications arrive"""
+        stop = stop or threading.Event()
+        self.always_verify_misses = True
+        queue = WebhookQueue(max_size=queue_size, debounce=debounce)
+        self.load_library_index(media_type)
+
+        def work() -> None:
+            while True:
+                request_id = queue.get(stop)
+                if request_id is None:
+                    return
+                try:
+                    req = self.overseerr.get_request(request_id)
+                    if req is None or media_type not in (None, req.media_type):
+                        continue
+                    if req.status != RequestStatus.APPROVED.value:
+                        continue
+                    result = self._reconcile_request(req, sync_mode)
+                    if sync_mode and result.outcome == Outcome.UNMONITORED_SEASONS:
+                        result = self._monitor_seasons([result])[0]
+                    self._report(result)
+                except requests.exceptions.RequestException as e:
+                    print(
+                        f"  ⚠️  Failed to reconcile request {request_id}: {e}",
+                        file=sys.stderr,
+                    )
+
+        def refresh_index() -> None:
+            while not stop.wait(index_refresh):
+                try:
+                    self.load_library_index(media_type)
+                    self.save_library_cache()
+                    self.titles.save()
+                except requests.exceptions.RequestException as e:
+                    print(f"  ⚠️  Index refresh failed: {e}", file=sys.stderr)
+
+        server = WebhookServer(("", port), WebhookHandler)
+        server.queue = queue
+        server.secret = secret
+        threads = [threading.Thread(target=refresh_index, daemon=True)] + [
+            threading.Thread(target=work, daemon=True) for _ in range(self.max_workers)
+        ]
+        for thread in threads:
+            thread.start()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        self.reporter.info(
+            f"\n📡 Listening for Overseerr webhooks on :{port}/webhook (+ /metrics)"
+        )
+        stop.wait()
+        server.shutdown()
+        self.save_library_cache()
+        self.titles.save()
+        self.reporter.info("👋 Webhook receiver stopped")
+
+    def _reconcile_request(
+        self,
+        req: OverseerrRequest,
+        sync_mode: bool,
+        flights: Optional[SingleFlight] = None,
+    ) -> ReconcileResult:
+        """Check one request against the index and add it if sync_mode is set
+
+        Requests for the same item on the same instance share one check/add
+        through `flights` (by default only while one is in flight); each
+        still gets its own result. A present show whose requested seasons
+        aren't monitored comes back as UNMONITORED_SEASONS, for
+        _monitor_seasons to fix.
+        """
+        if req.media_type == MediaType.TV and not req.tvdb_id:
+            # Without a TVDB ID only Overseerr's own link can place it
+            if not self._linked_item(req, self._clients_for(req)):
+                return ReconcileResult(req, Outcome.NO_TVDB, req.title)
+            result = ReconcileResult(req, Outcome.PRESENT, req.title)
+        else:
+            key = self._item_key(req)
+            result, shared = (flights or self._inflight).do(
+                key, lambda: self._reconcile_item(req, sync_mode)
+            )
+            if shared:
+                METRICS.inc("coalesced_requests_total")
+                result = ReconcileResult(
+                    req, result.outcome, result.title, covered_by=result.request.id
+                )
+
+        # Seasons are per request, so this runs after any shared check
+        if result.outcome == Outcome.PRESENT and req.seasons:
+            located = self._indexed_item(req)
+            if located:
+                _, item = located
+                gap = tuple(n for n in req.seasons if n in item.unmonitored_seasons)
+                if gap:
+                    return ReconcileResult(
+                        req, Outcome.UNMONITORED_SEASONS, item.title or req.title, gap
+                    )
+        return result
+
+    def _monitor_seasons(self, gaps: List[ReconcileResult]) -> List[ReconcileResult]:
+        """Monitor the requested seasons behind UNMONITORED_SEASONS results
+
+        Seasons requested for the same show are merged, so each show gets
+        one series update however many requests name it. Results come back
+        in the same order as `gaps`.
+        """
+        shows: Dict[Tuple[str, int], Tuple[SonarrClient, LibraryItem, Set[int]]] = {}
+        keys: List[Optional[Tuple[str, int]]] = []
+        for result in gaps:
+            client, item = self._indexed_item(result.request) or (None, None)
+            if not isinstance(client, SonarrClient) or item is None:
+                keys.append(None)
+                continue
+            key = (client.key, item.arr_id)
+            shows.setdefault(key, (client, item, set()))[2].update(result.seasons)
+            keys.append(key)
+
+        def monitor(show: Tuple[SonarrClient, LibraryItem, Set[int]]) -> bool:
+            client, item, seasons = show
+            with PROFILER.phase("seasons"):
+                return client.monitor_seasons(item.arr_id, sorted(seasons))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            done = dict(zip(shows, pool.map(monitor, shows.values())))
+
+        for key, (client, item, seasons) in shows.items():
+            if done[key]:
+                remaining = tuple(
+                    n for n in item.unmonitored_seasons if n not in seasons
+                )
+                self._record_added(client, replace(item, unmonitored_seasons=remaining))
+
+        return [
+            ReconcileResult(
+                result.request,
+                Outcome.MONITORED_SEASONS
+                if key and done[key]
+                else Outcome.UNMONITORED_SEASONS,
+                result.title,
+                result.seasons,
+            )
+            for result, key in zip(gaps, keys)
+        ]
+
+    def _reconcile_item(
+        self, req: OverseerrRequest, sync_mode: bool
+    ) -> ReconcileResult:
+        if self._in_library(req):
+            return ReconcileResult(req, Outcome.PRESENT, req.title)
+
+        title = self._get_media_title(req)
+        if not sync_mode:
+            return ReconcileResult(req, Outcome.MISSING, title)
+
+        client = self._clients_for(req)[0]
+        ext_id = external_id(req)
+        with PROFILER.phase("add"):
+            added = client.add_item(ext_id)
+        if added:
+            self._record_added(client, replace(added, title=added.title or title))
+            return ReconcileResult(req, Outcome.ADDED, title)
+        return ReconcileResult(req, Outcome.FAILED, title)
+
+    def _add_batched(
+        self, pending: List[ReconcileResult], batch_size: int
+    ) -> List[ReconcileResult]:
+        """Add missing items through the bulk import endpoints
+
+        Payload lookups run concurrently; each backend then receives its items
+        in batches. Results come back in the same order as `pending`.
+        """
+
+        def client_for(req: OverseerrRequest) -> ArrClient:
+            return self._clients_for(req)[0]
+
+        def build_payload(req: OverseerrRequest) -> Optional[Dict]:
+            with PROFILER.phase("add"):
+                return client_for(req).build_add_payload(external_id(req))
+
+        # One payload per distinct title and instance, even if several
+        # requests share it
+        unique: Dict[Tuple[str, int], OverseerrRequest] = {}
+        for result in pending:
+            req = result.request
+            unique.setdefault((client_for(req).key, external_id(req)), req)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            payloads = dict(
+                zip(
+                    unique.keys(),
+                    pool.map(build_payload, unique.values()),
+                )
+            )
+
+        added: Dict[Tuple[str, int], LibraryItem] = {}
+        for client in self.arr_clients:
+            batch = [
+                payload
+                for (key, _), payload in payloads.items()
+                if key == client.key and payload
+            ]
+            if batch:
+                with PROFILER.phase("add"):
+                    imported = client.import_items(batch, batch_size)
+                added.update(
+                    ((client.key, ext_id), item) for ext_id, item in imported.items()
+                )
+
+        results = []
+        for result in pending:
+            req = result.request
+            client = client_for(req)
+            key = (client.key, external_id(req))
+            first = unique[key]
+            covered_by = first.id if req is not first else None
+            if key in added:
+                if covered_by is None:
+                    item = added[key]
+                    self._record_added(
+                        client, replace(item, title=item.title or result.title)
+                    )
+                outcome = Outcome.ADDED
+            else:
+                outcome = Outcome.FAILED
+            results.append(
+                ReconcileResult(req, outcome, result.title, covered_by=covered_by)
+            )
+        return results
+
+    def _item_key(self, req: OverseerrRequest) -> Tuple[MediaType, int, str]:
+        """What requests for the same item on the same instance have in common"""
+        return (req.media_type, external_id(req), self._clients_for(req)[0].key)
+
+    def _finish_run(self) -> None:
+        """Mark a one-shot run complete, so --resume starts afresh after it"""
+        if self.journal:
+            self.journal.close(completed=True)
+        METRICS.set("last_run_timestamp_seconds", time.time())
+
+    def _report(self, result: ReconcileResult) -> None:
+        """Count, journal and report a reconciliation result"""
+        METRICS.record_result(result)
+        if self.journal:
+            self.journal.record(result)
+        self.reporter.result(result)
+
+    def _get_media_title(self, req: OverseerrRequest) -> str:
+        """Resolve a display title, asking Overseerr only when we have to"""
+        if req.has_title:
+            return req.title
+
+        key = TitleCache.key(req.media_type, req.tmdb_id)
+        cached = self.titles.get(key)
+        if cached:
+            return cached
+
+        try:
+            # Overseerr keys both /movie and /tv by TMDB ID
+            endpoint = f"/api/v1/{req.media_type.value}/{req.tmdb_id}"
+            with PROFILER.phase("titles"):
+                data = self.overseerr.get(endpoint)
+        except Exception:
+            return req.title
 
-        return success_count
+        title = data.get("title") or data.get("name")
+        if not title:
+            return req.title
+        self.titles.put(key, title)
+        return title
 
 
 def load_config() -> Config:
     """Load configuration from environment or prompt user"""
-    import os
-
     # Try to load from environment variables
     overseerr_url = os.getenv(
         "OVERSEERR_URL", "http://overseerr.media.svc.cluster.local:5055"
     )
     overseerr_api_key = os.getenv("OVERSEERR_API_KEY", "")
-    sonarr_url = os.getenv("SONARR_URL", "http://sonarr.media.svc.cluster.local:8989")
-    sonarr_api_key = os.getenv("SONARR_API_KEY", "")
-    radarr_url = os.getenv("RADARR_URL", "http://radarr.media.svc.cluster.local:7878")
-    radarr_api_key = os.getenv("RADARR_API_KEY", "")
 
     # Prompt for missing values
     if not overseerr_api_key:
         overseerr_api_key = input("Overseerr API Key: ").strip()
-    if not sonarr_api_key:
-        sonarr_api_key = input("Sonarr API Key: ").strip()
-    if not radarr_api_key:
-        radarr_api_key = input("Radarr API Key: ").strip()
 
     return Config(
         overseerr_url=overseerr_url,
         overseerr_api_key=overseerr_api_key,
-        sonarr_url=sonarr_url,
-        sonarr_api_key=sonarr_api_key,
-        radarr_url=radarr_url,
-        radarr_api_key=radarr_api_key,
+        sonarr=load_arr_instances(
+            "sonarr", "http://sonarr.media.svc.cluster.local:8989"
+        ),
+        radarr=load_arr_instances(
+            "radarr", "http://radarr.media.svc.cluster.local:7878"
+        ),
     )
 
 
+def load_arr_instances(backend: str, default_url: str) -> List[ArrInstance]:
+    """Sonarr/Radarr instances from the environment, prompting for missing keys
+
+    SONARR_URL/SONARR_API_KEY configure the default instance, and setting
+    SONARR_4K_URL/SONARR_4K_API_KEY adds a 4K one. For other layouts list
+    the names in SONARR_INSTANCES and set SONARR_<NAME>_URL and
+    SONARR_<NAME>_API_KEY for each ("default" uses the unprefixed names).
+    Optional per-instance SONARR_<NAME>_IS_4K, SONARR_<NAME>_PROFILE and
+    SONARR_<NAME>_ROOT mark it as 4K (implied for "4k") and override
+    --sonarr-profile/--sonarr-root. Radarr works the same with RADARR_.
+    """
+    prefix = backend.upper()
+    names = [
+        n.strip() for n in os.getenv(f"{prefix}_INSTANCES", "").split(",") if n.strip()
+    ]
+    if not names:
+        names = ["default"] + (["4k"] if os.getenv(f"{prefix}_4K_URL") else [])
+
+    instances = []
+    for name in names:
+        env = prefix
+        label = backend.title()
+        if name != "default":
+            env = f"{prefix}_{name.upper().replace('-', '_')}"
+            label = f"{backend.title()} ({name})"
+
+        url = os.getenv(f"{env}_URL", default_url if name == "default" else "")
+        if not url:
+            url = input(f"{label} URL: ").strip()
+        api_key = os.getenv(f"{env}_API_KEY", "")
+        if not api_key:
+            api_key = input(f"{label} API Key: ").strip()
+
+        is_4k = os.getenv(f"{env}_IS_4K", "").lower() in ("1", "true", "yes")
+        instances.append(
+            ArrInstance(
+                name=name,
+                url=url,
+                api_key=api_key,
+                is_4k=is_4k or name.lower() == "4k",
+                quality_profile=os.getenv(f"{env}_PROFILE"),
+                root_folder=os.getenv(f"{env}_ROOT"),
+            )
+        )
+    return instances
+
+
+def parse_backend_values(value: str, kind: str, cast: Callable) -> Dict[str, Any]:
+    """Parse a backend=value list such as 'sonarr=4,radarr=4'"""
+    values: Dict[str, Any] = {}
+    for part in value.split(","):
+        if not part.strip():
+            continue
+        backend, sep, raw = part.partition("=")
+        backend = backend.strip().lower()
+        if not sep or backend not in ("overseerr", "sonarr", "radarr"):
+            raise argparse.ArgumentTypeError(
+                f"invalid {kind} '{part}' (expected overseerr|sonarr|radarr=N)"
+            )
+        try:
+            values[backend] = cast(raw)
+        except ValueError:
+            raise argparse.ArgumentTypeError(
+                f"invalid {kind} '{raw}' for {backend}"
+            ) from None
+        if values[backend] <= 0:
+            raise argparse.ArgumentTypeError(f"{kind} for {backend} must be positive")
+    return values
+
+
+def parse_concurrency(value: str) -> Dict[str, int]:
+    """Parse a backend=limit list such as 'sonarr=4,radarr=4'"""
+    return parse_backend_values(value, "concurrency", int)
+
+
+def parse_rate_limit(value: str) -> Dict[str, float]:
+    """Parse a backend=requests-per-second list such as 'sonarr=5,radarr=2.5'"""
+    return parse_backend_values(value, "rate limit", float)
+
+
+def default_cache_dir() -> Path:
+    """Per-user cache directory for library snapshots"""
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(Path.home(), ".cache")
+    return Path(base) / "overseerr-reconcile"
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Reconcile Overseerr requests with Sonarr/Radarr"
@@ -592,18 +3251,273 @@ def main():
         action="store_true",
         help="Re-submit missing requests to Sonarr/Radarr",
     )
+    parser.add_argument(
+        "--diff",
+        action="store_true",
+        help="Print missing requests, library items with no request and requests "
+        "not marked available, as JSON (one object per item with --report jsonl)",
+    )
     parser.add_argument(
         "--type", choices=["movie", "tv"], help="Filter by media type (movie or tv)"
     )
     parser.add_argument(
         "--debug", action="store_true", help="Enable debug output showing API responses"
     )
+    parser.add_argument(
+        "--yes",
+        "-y",
+        action="store_true",
+        help="Don't ask for confirmation before adding items (for unattended runs)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and reconcile new or changed requests as they appear",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run an HTTP receiver for Overseerr webhook notifications",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8080,
+        help="Port for --serve (default: 8080)",
+    )
+    parser.add_argument(
+        "--webhook-secret",
+        default=os.getenv("WEBHOOK_SECRET"),
+        help="Required Authorization header value for webhooks (env: WEBHOOK_SECRET)",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=5,
+        metavar="SECONDS",
+        help="Wait this long for repeat notifications before reconciling (default: 5)",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=100,
+        help="Max requests waiting to be reconciled in --serve mode (default: 100)",
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        help="Serve Prometheus /metrics on this port in --watch mode",
+    )
+    parser.add_argument(
+        "--metrics-file",
+        type=Path,
+        help="Write Prometheus metrics here at the end of a one-shot run "
+        "(node_exporter textfile collector format)",
+    )
+    parser.add_argument(
+        "--pushgateway",
+        metavar="URL",
+        help="Push metrics to this Prometheus Pushgateway at the end of a one-shot run",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=300,
+        metavar="SECONDS",
+        help="Seconds between polls in --watch mode (default: 300)",
+    )
+    parser.add_argument(
+        "--index-refresh",
+        type=float,
+        default=3600,
+        metavar="SECONDS",
+        help="Seconds between library index refreshes in --watch/--serve mode "
+        "(default: 3600)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=parse_concurrency,
+        default={},
+        metavar="BACKEND=N[,...]",
+        help="Max parallel requests per backend, e.g. sonarr=4,radarr=4 "
+        "(default: 1 each)",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        type=parse_rate_limit,
+        default={},
+        metavar="BACKEND=RPS[,...]",
+        help="Max requests per second per backend, e.g. sonarr=5,radarr=5 "
+        "(default: unlimited)",
+    )
+    parser.add_argument(
+        "--sonarr-profile",
+        metavar="NAME|ID",
+        help="Sonarr quality profile for added series (default: first profile)",
+    )
+    parser.add_argument(
+        "--sonarr-root",
+        metavar="PATH|ID",
+        help="Sonarr root folder for added series (default: first root folder)",
+    )
+    parser.add_argument(
+        "--radarr-profile",
+        metavar="NAME|ID",
+        help="Radarr quality profile for added movies (default: first profile)",
+    )
+    parser.add_argument(
+        "--radarr-root",
+        metavar="PATH|ID",
+        help="Radarr root folder for added movies (default: first root folder)",
+    )
+    parser.add_argument(
+        "--retry-via-overseerr",
+        action="store_true",
+        help="With --sync, ask Overseerr to retry missing and failed requests "
+        "instead of adding them to Sonarr/Radarr directly",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=0,
+        metavar="N",
+        help="With --sync, add missing items via the bulk import API in batches "
+        "of N after checking (default: add one at a time as found)",
+    )
+    parser.add_argument(
+        "--missing-files",
+        action="store_true",
+        help="Look for requested items that are in Sonarr/Radarr but have no "
+        "files instead; --sync triggers a search for each",
+    )
+    parser.add_argument(
+        "--search-batch-size",
+        type=int,
+        default=10,
+        metavar="N",
+        help="With --missing-files --sync, movies per MoviesSearch command and "
+        "series searched per batch (default: 10)",
+    )
+    parser.add_argument(
+        "--search-interval",
+        type=float,
+        default=60,
+        metavar="SECONDS",
+        help="Pause between search batches so indexers aren't flooded (default: 60)",
+    )
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        default=50,
+        help="Overseerr requests fetched per page (default: 50)",
+    )
+    parser.add_argument(
+        "--report",
+        choices=["console", "jsonl"],
+        default="console",
+        help="Result output: console (default) or one JSON object per request "
+        "on stdout, with progress on stderr",
+    )
+    parser.add_argument(
+        "--journal",
+        type=Path,
+        metavar="PATH",
+        help="Log each handled request here (default: journal.jsonl in --cache-dir)",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip requests that an interrupted --check/--sync run already finished",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=default_cache_dir(),
+        help="Directory for the Sonarr/Radarr library snapshot cache",
+    )
+    parser.add_argument(
+        "--cache-max-age",
+        type=float,
+        default=24,
+        metavar="HOURS",
+        help="Force a full library refresh when the cache is older than this "
+        "(default: 24). Items deleted from Sonarr/Radarr can be reported as "
+        "present until then",
+    )
+    parser.add_argument(
+        "--refresh-cache",
+        action="store_true",
+        help="Ignore the cached library snapshot and fetch everything",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't read or write the library snapshot cache",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print wall time per phase and HTTP calls per endpoint at the end",
+    )
+    parser.add_argument(
+        "--profile-stats",
+        type=Path,
+        metavar="PATH",
+        help="Also write a cProfile dump of the run, worker threads included "
+        "(implies --profile)",
+    )
+    parser.add_argument(
+        "--profile-trace",
+        type=Path,
+        metavar="PATH",
+        help="Also write every HTTP call as a Chrome trace JSON (implies --profile)",
+    )
 
     args = parser.parse_args()
 
-    if not args.check and not args.sync:
+    if not args.check and not args.sync and not args.diff:
         parser.print_help()
         sys.exit(1)
+    if args.diff and (args.check or args.sync or args.watch or args.serve):
+        parser.error("--diff can't be combined with --check/--sync/--watch/--serve")
+    if args.watch and args.serve:
+        parser.error("--watch and --serve are mutually exclusive")
+    if args.retry_via_overseerr and not args.sync:
+        parser.error("--retry-via-overseerr requires --sync")
+    if args.retry_via_overseerr and (args.watch or args.serve):
+        parser.error("--retry-via-overseerr only applies to one-shot --sync runs")
+    if args.resume and (args.watch or args.serve):
+        parser.error("--resume only applies to one-shot --check/--sync runs")
+    if args.missing_files and (
+        args.diff or args.watch or args.serve or args.retry_via_overseerr or args.resume
+    ):
+        parser.error(
+            "--missing-files only applies to one-shot --check/--sync runs "
+            "without --retry-via-overseerr/--resume"
+        )
+    if args.batch_size < 0:
+        parser.error("--batch-size must be 0 or more")
+    if args.batch_size and (
+        not args.sync
+        or args.watch
+        or args.serve
+        or args.retry_via_overseerr
+        or args.missing_files
+    ):
+        parser.error("--batch-size only applies to one-shot --sync runs")
+    if args.metrics_port and not args.watch:
+        parser.error(
+            "--metrics-port only applies to --watch (--serve has /metrics on --port)"
+        )
+    if args.page_size < 1:
+        parser.error("--page-size must be at least 1")
+    if args.search_batch_size < 1:
+        parser.error("--search-batch-size must be at least 1")
+
+    if args.profile_stats or args.profile_trace:
+        args.profile = True
+    if args.profile:
+        PROFILER.enable(trace=bool(args.profile_trace))
 
     # Load configuration
     try:
@@ -613,50 +3527,180 @@ def main():
         sys.exit(0)
 
     # Initialize service
-    service = ReconciliationService(config)
+    # --diff writes JSON to stdout either way, so progress goes to stderr
+    if args.report == "jsonl" or args.diff:
+        reporter: Reporter = JsonlReporter()
+    else:
+        reporter = ConsoleReporter()
+    cache = None
+    if not args.no_cache:
+        cache = LibraryCache(
+            args.cache_dir, max_age=args.cache_max_age * 3600, log=reporter.info
+        )
+    titles = TitleCache(args.cache_dir / "titles.json" if cache else None)
+    journal = None
+    if not (args.watch or args.serve):
+        journal = Journal(args.journal or args.cache_dir / "journal.jsonl")
+    service = ReconciliationService(
+        config,
+        concurrency=args.concurrency,
+        cache=cache,
+        titles=titles,
+        page_size=args.page_size,
+        rate_limits=args.rate_limit,
+        reporter=reporter,
+        journal=journal,
+    )
 
     # Filter by media type if specified
     media_type = None
     if args.type:
         media_type = MediaType.MOVIE if args.type == "movie" else MediaType.TV
 
+    profiler = None
+    if args.profile_stats:
+        profiler = StatsProfiler()
+        profiler.start()
+
     # Find missing requests (and add them if sync mode)
     try:
-        if args.sync:
-            # In sync mode, ask for confirmation first
-            confirm = input(
-                "\n⚠️  This will add missing items to Sonarr/Radarr as they're found. Proceed? (yes/no): "
-            )
+        # In sync mode, ask for confirmation first
+        if args.sync and not args.yes:
+            if args.missing_files:
+                prompt = "search for requested items that have no files"
+            elif args.retry_via_overseerr:
+                prompt = "ask Overseerr to retry missing and failed requests"
+            else:
+                prompt = "add missing items to Sonarr/Radarr as they're found"
+            confirm = input(f"\n⚠️  This will {prompt}. Proceed? (yes/no): ")
             if confirm.lower() not in ["yes", "y"]:
                 print("Cancelled by user")
                 sys.exit(0)
 
+        if args.sync and not (args.retry_via_overseerr or args.missing_files):
+            # Resolve add settings up front so a typo fails before any work
+            service.configure_clients(
+                media_type,
+                {
+                    "sonarr": (args.sonarr_profile, args.sonarr_root),
+                    "radarr": (args.radarr_profile, args.radarr_root),
+                },
+            )
+
+        if args.watch or args.serve:
+            # Line-buffer output so container logs show each cycle promptly
+            sys.stdout.reconfigure(line_buffering=True)  # type: ignore[union-attr]
+            stop = threading.Event()
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                signal.signal(sig, lambda *_: stop.set())
+
+        if args.diff:
+            print_diff(service.diff(media_type), jsonl=args.report == "jsonl")
+        elif args.serve:
+            service.serve(
+                port=args.port,
+                index_refresh=args.index_refresh,
+                media_type=media_type,
+                sync_mode=args.sync,
+                secret=args.webhook_secret,
+                debounce=args.debounce,
+                queue_size=args.queue_size,
+                stop=stop,
+            )
+        elif args.watch:
+            if args.metrics_port:
+                metrics_server = ThreadingHTTPServer(
+                    ("", args.metrics_port), MetricsHandler
+                )
+                metrics_server.daemon_threads = True
+                threading.Thread(
+                    target=metrics_server.serve_forever, daemon=True
+                ).start()
+                reporter.info(f"📈 Serving metrics on :{args.metrics_port}/metrics")
+            service.watch(
+                interval=args.interval,
+                index_refresh=args.index_refresh,
+                media_type=media_type,
+                sync_mode=args.sync,
+                stop=stop,
+            )
+        elif args.missing_files:
+            missing = service.find_missing_files(
+                media_type,
+                search=args.sync,
+                batch_size=args.search_batch_size,
+                interval=args.search_interval,
+            )
+
+            reporter.info(f"\n{'=' * 60}")
+            if args.sync and missing:
+                reporter.info(
+                    f"⚠️  {len(missing)} search command(s) failed - review errors above"
+                )
+            elif args.sync:
+                reporter.info("✅ Searches queued for every item without files")
+            else:
+                reporter.info(
+                    f"📊 Summary: {len(missing)} request(s) for items without files"
+                )
+            reporter.info(f"{'=' * 60}")
+            if missing and not args.sync:
+                reporter.info("\nRun with --sync to search for these items")
+        elif args.sync and args.retry_via_overseerr:
+            failed = service.retry_via_overseerr(
+                media_type,
+                debug=args.debug,
+                refresh_cache=args.refresh_cache,
+                resume=args.resume,
+            )
+
+            reporter.info(f"\n{'=' * 60}")
+            if failed:
+                reporter.info(
+                    f"⚠️  {len(failed)} item(s) still missing after retry - "
+                    "check the Overseerr logs"
+                )
+            else:
+                reporter.info("✅ All retried items are now in Sonarr/Radarr!")
+            reporter.info(f"{'=' * 60}")
+        elif args.sync:
             # Run in sync mode - adds as it goes
             failed = service.find_missing_requests(
-                media_type, debug=args.debug, sync_mode=True
+                media_type,
+                debug=args.debug,
+                sync_mode=True,
+                refresh_cache=args.refresh_cache,
+                batch_size=args.batch_size,
+                resume=args.resume,
             )
 
             # Summary
-            print(f"\n{'=' * 60}")
+            reporter.info(f"\n{'=' * 60}")
             if failed:
-                print(f"⚠️  {len(failed)} item(s) failed to add - review errors above")
-                print(f"{'=' * 60}")
+                reporter.info(
+                    f"⚠️  {len(failed)} item(s) failed to add - review errors above"
+                )
+                reporter.info(f"{'=' * 60}")
             else:
-                print("✅ All missing items added successfully!")
-                print(f"{'=' * 60}")
+                reporter.info("✅ All missing items added successfully!")
+                reporter.info(f"{'=' * 60}")
         else:
             # Check mode - just report
             missing = service.find_missing_requests(
-                media_type, debug=args.debug, sync_mode=False
+                media_type,
+                debug=args.debug,
+                sync_mode=False,
+                refresh_cache=args.refresh_cache,
+                resume=args.resume,
             )
 
             # Summary
-            print(f"\n{'=' * 60}")
-            print(f"📊 Summary: {len(missing)} missing request(s) found")
-            print(f"{'=' * 60}")
+            reporter.info(f"\n{'=' * 60}")
+            reporter.info(f"📊 Summary: {len(missing)} missing request(s) found")
+            reporter.info(f"{'=' * 60}")
 
             if missing:
-                print("\nRun with --sync to add these items to Sonarr/Radarr")
+                reporter.info("\nRun with --sync to add these items to Sonarr/Radarr")
 
     except Exception as e:
         print(f"\n❌ Failed to process requests: {e}", file=sys.stderr)
@@ -665,6 +3709,59 @@ def main():
 
             traceback.print_exc()
         sys.exit(1)
+    finally:
+        if journal:
+            journal.close()
+        if args.profile:
+            write_profile(args, reporter, profiler)
+        export_metrics(args)
+
+
+def print_diff(groups: Dict[str, List[Dict]], jsonl: bool = False) -> None:
+    """Write --diff results as one JSON document, or one line per item"""
+    if jsonl:
+        for category, entries in groups.items():
+            for entry in entries:
+                print(json.dumps({"category": category, **entry}, ensure_ascii=False))
+        return
+    document = {
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "counts": {category: len(entries) for category, entries in groups.items()},
+        **groups,
+    }
+    print(json.dumps(document, indent=2, ensure_ascii=False))
+
+
+def write_profile(
+    args: argparse.Namespace, reporter: Reporter, profiler: Optional[StatsProfiler]
+) -> None:
+    """Print the --profile tables and write any requested dumps"""
+    reporter.info(f"\n⏱️  Profile\n{'=' * 60}")
+    for line in PROFILER.summary():
+        reporter.info(line)
+    if profiler is not None:
+        profiler.dump(args.profile_stats)
+        reporter.info(
+            f"\n📝 cProfile stats written to {args.profile_stats}"
+            f" (python -m pstats {args.profile_stats})"
+        )
+    if args.profile_trace:
+        PROFILER.write_trace(args.profile_trace)
+        reporter.info(f"📝 HTTP trace written to {args.profile_trace}")
+
+
+def export_metrics(args: argparse.Namespace) -> None:
+    """Write and/or push metrics for one-shot runs, if requested"""
+    if args.metrics_file:
+        try:
+            METRICS.write_textfile(args.metrics_file)
+        except OSError as e:
+            print(f"⚠️  Could not write metrics file: {e}", file=sys.stderr)
+    if args.pushgateway:
+        try:
+            METRICS.push(args.pushgateway)
+        except requests.exceptions.RequestException as e:
+            print(f"⚠️  Could not push metrics: {e}", file=sys.stderr)
 
 
 if __name__ == "__main__":
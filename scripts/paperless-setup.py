@@ -2,23 +2,43 @@
 """
 Paperless-NGX Initial Setup Script
 
-This script uses the Paperless API to create:
+This script uses the Paperless API to converge an instance on the taxonomy
+in paperless-taxonomy.yaml:
 - Tags (Person/Pet/Vehicle, Topic/Category, Business Context, Tax)
 - Document Types
 - Custom Fields
 - Workflows (inbox auto-tagging)
 
+`plan` compares the spec with what Paperless already has - new objects,
+renames (via renamed_from), and tag parent/colour/inbox changes - and
+prints the change set. `apply` makes exactly those changes. Objects that
+aren't in the spec are never touched, so re-running against an instance
+that already matches costs one listing per resource and no writes.
+
 Usage:
     export PAPERLESS_URL="https://paperless.albatrossflavour.com"
     export PAPERLESS_TOKEN="your-api-token-here"
-    python3 paperless-setup.py
+    python3 paperless-setup.py plan
+    python3 paperless-setup.py apply
+    python3 paperless-setup.py plan --spec other-taxonomy.json
 """
 
+import argparse
+import json
 import os
 import sys
-from typing import Dict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import yaml
+except ImportError:  # JSON specs still work without PyYAML
+    yaml = None  # type: ignore[assignment]
 
 # Configuration
 PAPERLESS_URL = os.getenv("PAPERLESS_URL", "https://paperless.albatrossflavour.com")
@@ -35,290 +55,307 @@ HEADERS = {
     "Content-Type": "application/json",
 }
 
-# Color palette for tags (you can customize)
-COLORS = {
-    "person": "#3498db",  # Blue for people
-    "pet": "#e74c3c",  # Red for pets
-    "vehicle": "#9b59b6",  # Purple for vehicles
-    "medical": "#e67e22",  # Orange for medical
-    "financial": "#27ae60",  # Green for financial
-    "ndis": "#f39c12",  # Yellow for NDIS
-    "personal": "#1abc9c",  # Teal for personal
-    "pets": "#e74c3c",  # Red for pet category
-    "property": "#34495e",  # Dark gray for property
-    "vehicles": "#9b59b6",  # Purple for vehicle category
-    "work": "#2c3e50",  # Darker gray for work
-    "business": "#16a085",  # Dark teal for business
-    "tax": "#c0392b",  # Dark red for tax
-    "default": "#95a5a6",  # Light gray default
-}
+# Paperless caps page_size at this, so most lists fit in a single page
+MAX_PAGE_SIZE = 100_000
+# Parallel requests for extra pages and for independent changes
+MAX_WORKERS = 8
+# Seconds to wait for Paperless to connect/respond
+TIMEOUT = 30
 
+# One keep-alive connection per worker, shared by every call
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("http://", HTTPAdapter(pool_maxsize=MAX_WORKERS))
+SESSION.mount("https://", HTTPAdapter(pool_maxsize=MAX_WORKERS))
 
-def api_get(endpoint: str) -> Dict:
-    """Make GET request to Paperless API"""
-    url = f"{PAPERLESS_URL}/api/{endpoint}/"
-    response = requests.get(url, headers=HEADERS)
-    response.raise_for_status()
-    return response.json()
+# Resources the spec describes, in the order changes are shown
+RESOURCES = ["tags", "document_types", "custom_fields", "workflows"]
 
+DEFAULT_SPEC = Path(__file__).with_name("paperless-taxonomy.yaml")
 
-def api_post(endpoint: str, data: Dict) -> Dict:
-    """Make POST request to Paperless API"""
+
+def api_get(endpoint: str, params: Optional[Dict] = None) -> Dict:
+    """Make GET request to Paperless API"""
     url = f"{PAPERLESS_URL}/api/{endpoint}/"
-    response = requests.post(url, headers=HEADERS, json=data)
+    response = SESSION.get(url, params=params, timeout=TIMEOUT)
     response.raise_for_status()
     return response.json()
 
 
-def get_color(tag_name: str) -> str:
-    """Determine color based on tag name"""
-    name_lower = tag_name.lower()
-
-    # Check for category prefixes
-    for key, color in COLORS.items():
-        if name_lower.startswith(key):
-            return color
-
-    # Check for specific tags
-    if name_lower in ["tony", "dani", "edward", "harri"]:
-        return COLORS["person"]
-    if name_lower in ["murphy", "jeff"]:
-        return COLORS["pet"]
-    if name_lower in ["mini", "trax", "laser", "imprezza"]:
-        return COLORS["vehicle"]
-    if name_lower in ["home", "smsf/dha", "toodle pip designs"]:
-        return COLORS["business"]
-
-    return COLORS["default"]
-
+def api_get_all(endpoint: str) -> List[Dict]:
+    """Fetch every object of a resource, not just the first page
 
-def create_tags():
-    """Create all tags in the taxonomy with proper parent-child relationships"""
-    print("\n=== Creating Tags ===")
+    The first page tells us the total and the page size the server actually
+    used; any remaining pages are then fetched in parallel.
+    """
+    first = api_get(endpoint, {"page": 1, "page_size": MAX_PAGE_SIZE})
+    results = first.get("results", [])
+    count = first.get("count", len(results))
+    if not results or len(results) >= count:
+        return results
 
-    # Get existing tags
-    existing_tags_response = api_get("tags")
-    existing_tags_map = {
-        tag["name"]: tag for tag in existing_tags_response.get("results", [])
-    }
-
-    created_count = 0
-    skipped_count = 0
-
-    def create_tag(name, parent_id=None):
-        """Helper to create a single tag"""
-        nonlocal created_count, skipped_count
-
-        if name in existing_tags_map:
-            print(f"  ⏭️  Skipping '{name}' (already exists)")
-            skipped_count += 1
-            return existing_tags_map[name]["id"]
-
-        tag_data = {
-            "name": name,
-            "color": get_color(name),
-            "is_inbox_tag": (name == "inbox"),
-        }
-        if parent_id:
-            tag_data["parent"] = parent_id
-
-        try:
-            result = api_post("tags", tag_data)
-            tag_id = result["id"]
-            existing_tags_map[name] = result  # Cache for later lookups
-            indent = "    " if parent_id else "  "
-            print(f"{indent}✅ Created tag: {name}")
-            created_count += 1
-            return tag_id
-        except requests.exceptions.HTTPError as e:
-            print(f"  ❌ Failed to create '{name}': {e}")
-            return None
-
-    # Flat tags (no hierarchy)
-    flat_tags = [
-        "Tony",
-        "Dani",
-        "Edward",
-        "Harri",
-        "Home",
-        "SMSF/DHA",
-        "Toodle Pip Designs",
-        "inbox",
-    ]
-
-    for tag_name in flat_tags:
-        create_tag(tag_name)
-
-    # Hierarchical tags (parent -> children)
-    hierarchical_tags = {
-        "Medical": [
-            "Reports",
-            "Discharge",
-            "Prescriptions",
-            "Appointments",
-            "Test Results",
-        ],
-        "Financial": ["Bills", "Receipts", "Statements", "Invoices"],
-        "NDIS": ["Plans", "Reports", "Invoices", "Correspondence"],
-        "Personal": ["Certificates", "Legal", "Education", "Life Insurance"],
-        "Pets": [
-            "Murphy",
-            "Jeff",
-            "Veterinary",
-            "Pet Registration",
-            "Pet Insurance",
-            "Boarding",
-            "Records",
-        ],
-        "Property": [
-            "Lease",
-            "Home Insurance",
-            "Property Manuals",
-            "Utilities",
-            "Property Repairs",
-            "Renovations",
-            "Rates",
-            "Management",
-        ],
-        "Vehicles": [
-            "Mini",
-            "Trax",
-            "Laser",
-            "Imprezza",
-            "Auto Insurance",
-            "Vehicle Registration",
-            "Service",
-            "Vehicle Repairs",
-            "Purchase",
-            "Vehicle Manuals",
-        ],
-        "Work": ["CAC", "Orchard", "Puppet"],
+    pages = -(-count // len(results))
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        rest = pool.map(
+            lambda page: api_get(endpoint, {"page": page, "page_size": len(results)}),
+            range(2, pages + 1),
+        )
+        for page in rest:
+            results.extend(page.get("results", []))
+    return results
+
+
+def load_index() -> Dict[str, Dict[str, Dict]]:
+    """Fetch each resource once and index it by name
+
+    The setup steps share this index and add what they create to it, so
+    nothing is fetched twice and every lookup is a dict access.
+    """
+    with ThreadPoolExecutor(max_workers=len(RESOURCES)) as pool:
+        fetched = dict(zip(RESOURCES, pool.map(api_get_all, RESOURCES)))
+    return {
+        resource: {obj["name"]: obj for obj in objects}
+        for resource, objects in fetched.items()
     }
 
-    # Create parent tags first, then children
-    for parent_name, children in hierarchical_tags.items():
-        parent_id = create_tag(parent_name)
-        if parent_id:
-            for child_name in children:
-                create_tag(child_name, parent_id)
-
-    # Tax hierarchical tags (Tax -> FY years)
-    # Note: Person tags (Tony, Dani) are applied separately as flat tags
-    tax_parent_id = create_tag("Tax")
-    if tax_parent_id:
-        for fy in ["FY2024-25", "FY2023-24", "FY2025-26"]:
-            create_tag(fy, tax_parent_id)
-
-    print(f"\nTags Summary: {created_count} created, {skipped_count} skipped")
-
-
-def create_document_types():
-    """Create all document types"""
-    print("\n=== Creating Document Types ===")
-
-    # Get existing document types
-    existing_types = api_get("document_types")
-    existing_type_names = {dt["name"] for dt in existing_types.get("results", [])}
-
-    document_types = [
-        "Invoice",
-        "Receipt",
-        "Bill",
-        "Certificate",
-        "Medical Report",
-        "Medical Discharge",
-        "NDIS Plan",
-        "NDIS Report",
-        "Bank Statement",
-        "Legal Document",
-        "Insurance Policy",
-        "Tax Document",
-    ]
-
-    created_count = 0
-    skipped_count = 0
-
-    for doc_type_name in document_types:
-        if doc_type_name in existing_type_names:
-            print(f"  ⏭️  Skipping '{doc_type_name}' (already exists)")
-            skipped_count += 1
-            continue
 
-        try:
-            doc_type_data = {"name": doc_type_name}
-            api_post("document_types", doc_type_data)
-            print(f"  ✅ Created document type: {doc_type_name}")
-            created_count += 1
-        except requests.exceptions.HTTPError as e:
-            print(f"  ❌ Failed to create '{doc_type_name}': {e}")
+def api_post(endpoint: str, data: Dict) -> Dict:
+    """Make POST request to Paperless API"""
+    url = f"{PAPERLESS_URL}/api/{endpoint}/"
+    response = SESSION.post(url, json=data, timeout=TIMEOUT)
+    response.raise_for_status()
+    return response.json()
 
-    print(f"\nDocument Types Summary: {created_count} created, {skipped_count} skipped")
 
+def api_patch(endpoint: str, obj_id: int, data: Dict) -> Dict:
+    """Make PATCH request to Paperless API, changing only the given fields"""
+    url = f"{PAPERLESS_URL}/api/{endpoint}/{obj_id}/"
+    response = SESSION.patch(url, json=data, timeout=TIMEOUT)
+    response.raise_for_status()
+    return response.json()
 
-def create_custom_fields():
-    """Create custom fields"""
-    print("\n=== Creating Custom Fields ===")
 
-    # Get existing custom fields
-    existing_fields = api_get("custom_fields")
-    existing_field_names = {cf["name"] for cf in existing_fields.get("results", [])}
+class SpecError(ValueError):
+    """The taxonomy spec is malformed"""
+
+
+@dataclass
+class Change:
+    """One write that brings Paperless closer to the spec"""
+
+    action: str  # "create" or "update"
+    resource: str
+    name: str
+    # Fields to send; a tag's parent and a workflow's tags are given by name
+    # and resolved to IDs when the change is applied
+    data: Dict[str, Any] = field(default_factory=dict)
+    obj_id: Optional[int] = None
+    # Current values of the changed fields, for display
+    old: Dict[str, Any] = field(default_factory=dict)
+    # Nesting depth of a tag; parents are applied before their children
+    depth: int = 0
+
+
+def load_spec(path: Path) -> Dict[str, List[Dict]]:
+    """Read a YAML/JSON spec and flatten it into one list per resource
+
+    Tag children become entries with a parent name, colours are resolved
+    to hex values, and names must be unique within a resource.
+    """
+    with open(path) as f:
+        if path.suffix == ".json":
+            raw = json.load(f)
+        elif yaml is None:
+            raise SpecError("PyYAML is needed for YAML specs (pip install pyyaml)")
+        else:
+            raw = yaml.safe_load(f)
+    if not isinstance(raw, dict):
+        raise SpecError("expected a mapping at the top level")
+
+    palette = raw.get("colors", {})
+
+    def color(value: str) -> str:
+        if value.startswith("#"):
+            return value.lower()
+        if value not in palette:
+            raise SpecError(f"unknown colour '{value}'")
+        return palette[value].lower()
+
+    default_color = color(raw.get("default_color", "#95a5a6"))
+
+    def entry(item: Any) -> Dict:
+        entry = {"name": item} if isinstance(item, str) else dict(item)
+        if not entry.get("name"):
+            raise SpecError(f"missing name in {item!r}")
+        renamed_from = entry.get("renamed_from") or []
+        if isinstance(renamed_from, str):
+            renamed_from = [renamed_from]
+        entry["renamed_from"] = renamed_from
+        return entry
+
+    tags: List[Dict] = []
+
+    def add_tags(items: List, parent: Optional[str], depth: int) -> None:
+        for item in items:
+            tag = entry(item)
+            children = tag.pop("children", [])
+            tag.update(
+                color=color(tag.get("color", default_color)),
+                is_inbox_tag=bool(tag.pop("inbox", False)),
+                parent=parent,
+                depth=depth,
+            )
+            tags.append(tag)
+            add_tags(children, tag["name"], depth + 1)
+
+    add_tags(raw.get("tags", []), None, 0)
+    spec = {
+        "tags": tags,
+        "document_types": [entry(item) for item in raw.get("document_types", [])],
+        "custom_fields": [entry(item) for item in raw.get("custom_fields", [])],
+        "workflows": [entry(item) for item in raw.get("workflows", [])],
+    }
 
-    custom_fields = [
-        {"name": "Financial Year", "data_type": "string"},
-        {"name": "Original Filename", "data_type": "string"},
-        {"name": "Amount", "data_type": "monetary"},
-        {"name": "Due Date", "data_type": "date"},
+    for resource, entries in spec.items():
+        seen = set()
+        for item in entries:
+            if item["name"] in seen:
+                raise SpecError(f"{resource} '{item['name']}' is listed twice")
+            seen.add(item["name"])
+    return spec
+
+
+def find_current(item: Dict, live: Dict[str, Dict], wanted: set) -> Optional[Dict]:
+    """The live object for a spec entry, by name or by a former name"""
+    if item["name"] in live:
+        return live[item["name"]]
+    for old_name in item["renamed_from"]:
+        # A former name that the spec still wants is not free to rename
+        if old_name in live and old_name not in wanted:
+            return live[old_name]
+    return None
+
+
+def plan(
+    spec: Dict[str, List[Dict]], index: Dict[str, Dict[str, Dict]]
+) -> List[Change]:
+    """The minimal set of creates/updates that makes Paperless match the spec"""
+    changes: List[Change] = []
+    tag_names = {tag["id"]: name for name, tag in index["tags"].items()}
+
+    for resource in RESOURCES:
+        live = index[resource]
+        wanted = {item["name"] for item in spec[resource]}
+        for item in spec[resource]:
+            desired: Dict[str, Any] = {}
+            if resource == "tags":
+                desired = {
+                    "color": item["color"],
+                    "is_inbox_tag": item["is_inbox_tag"],
+                    "parent": item["parent"],
+                }
+            elif resource == "custom_fields":
+                desired = {"data_type": item.get("data_type", "string")}
+            elif resource == "workflows":
+                desired = {"assign_tags": item.get("assign_tags", [])}
+
+            current = find_current(item, live, wanted)
+            if current is None:
+                changes.append(
+                    Change(
+                        "create",
+                        resource,
+                        item["name"],
+                        desired,
+                        depth=item.get("depth", 0),
+                    )
+                )
+                continue
+
+            data: Dict[str, Any] = {}
+            old: Dict[str, Any] = {}
+            if current["name"] != item["name"]:
+                data["name"], old["name"] = item["name"], current["name"]
+            if resource == "tags":
+                now = {
+                    "color": (current.get("color") or "").lower(),
+                    "is_inbox_tag": bool(current.get("is_inbox_tag")),
+                    "parent": tag_names.get(current.get("parent")),
+                }
+                for key, value in desired.items():
+                    if now[key] != value:
+                        data[key], old[key] = value, now[key]
+            elif resource == "workflows":
+                action = assignment_action(current) or {}
+                now_tags = [
+                    tag_names.get(tag_id, str(tag_id))
+                    for tag_id in action.get("assign_tags", [])
+                ]
+                if set(now_tags) != set(desired["assign_tags"]):
+                    data["assign_tags"] = desired["assign_tags"]
+                    old["assign_tags"] = now_tags
+            elif resource == "custom_fields" and (
+                current.get("data_type") != desired["data_type"]
+            ):
+                # Paperless won't change the type of a field in use
+                print(
+                    f"  ⚠️  Custom field '{item['name']}' is "
+                    f"{current.get('data_type')}, not {desired['data_type']} "
+                    "- change it by hand"
+                )
+            if data:
+                changes.append(
+                    Change(
+                        "update",
+                        resource,
+                        item["name"],
+                        data,
+                        obj_id=current["id"],
+                        old=old,
+                        depth=item.get("depth", 0),
+                    )
+                )
+    return changes
+
+
+def describe(change: Change) -> str:
+    """One line of plan output for a change"""
+    if change.action == "create":
+        details = [
+            f"{key} {value}"
+            for key, value in change.data.items()
+            if value not in (None, False, [])
+        ]
+        suffix = f" ({', '.join(details)})" if details else ""
+        return f"  + {change.resource}: {change.name}{suffix}"
+
+    name = change.name
+    if "name" in change.old:
+        name = f"{change.old['name']} → {change.name}"
+    details = [
+        f"{key} {change.old[key]} → {value}"
+        for key, value in change.data.items()
+        if key != "name"
     ]
+    suffix = f" ({', '.join(details)})" if details else ""
+    return f"  ~ {change.resource}: {name}{suffix}"
 
-    created_count = 0
-    skipped_count = 0
-
-    for field in custom_fields:
-        if field["name"] in existing_field_names:
-            print(f"  ⏭️  Skipping '{field['name']}' (already exists)")
-            skipped_count += 1
-            continue
-
-        try:
-            api_post("custom_fields", field)
-            print(f"  ✅ Created custom field: {field['name']} ({field['data_type']})")
-            created_count += 1
-        except requests.exceptions.HTTPError as e:
-            print(f"  ❌ Failed to create '{field['name']}': {e}")
-
-    print(f"\nCustom Fields Summary: {created_count} created, {skipped_count} skipped")
 
-
-def create_inbox_workflow():
-    """Create workflow to auto-apply inbox tag on document consumption"""
-    print("\n=== Creating Inbox Workflow ===")
-
-    # First, get the inbox tag ID
-    tags = api_get("tags")
-    inbox_tag = next(
-        (tag for tag in tags.get("results", []) if tag["name"] == "inbox"), None
-    )
-
-    if not inbox_tag:
-        print("  ⚠️  'inbox' tag not found. Create tags first.")
+def print_plan(changes: List[Change]) -> None:
+    print("\n=== Plan ===")
+    if not changes:
+        print("  ✅ Nothing to do - Paperless already matches the spec")
         return
+    for change in changes:
+        print(describe(change))
+    creates = sum(1 for c in changes if c.action == "create")
+    print(f"\nPlan: {creates} to create, {len(changes) - creates} to update")
 
-    inbox_tag_id = inbox_tag["id"]
 
-    # Check if workflow already exists
-    existing_workflows = api_get("workflows")
-    workflow_exists = any(
-        wf.get("name") == "Auto-add inbox tag"
-        for wf in existing_workflows.get("results", [])
-    )
-
-    if workflow_exists:
-        print("  ⏭️  Skipping 'Auto-add inbox tag' workflow (already exists)")
-        return
-
-    # Create workflow
-    workflow_data = {
-        "name": "Auto-add inbox tag",
+def workflow_payload(name: str, tag_ids: List[int]) -> Dict:
+    """A consumption workflow that assigns the given tags, from any source"""
+    return {
+        "name": name,
         "order": 0,
         "enabled": True,
         "triggers": [
@@ -333,7 +370,7 @@ def create_inbox_workflow():
         "actions": [
             {
                 "type": "assignment",
-                "assign_tags": [inbox_tag_id],
+                "assign_tags": tag_ids,
                 "assign_document_type": None,
                 "assign_correspondent": None,
                 "assign_storage_path": None,
@@ -347,37 +384,200 @@ def create_inbox_workflow():
         ],
     }
 
+
+def assignment_action(workflow: Dict) -> Optional[Dict]:
+    """The workflow's first assignment action, the one workflow_payload() makes"""
+    for action in workflow.get("actions", []):
+        # Paperless returns the action type as its enum value
+        if action.get("type") in (1, "assignment"):
+            return action
+    return None
+
+
+def apply_change(
+    change: Change, index: Dict[str, Dict[str, Dict]]
+) -> Tuple[bool, List[str]]:
+    """Send one change and record the result in the index
+
+    Returns whether it worked and the lines to report, which the caller
+    prints so output from concurrent changes doesn't interleave.
+    """
+    tags = index["tags"]
+    data = dict(change.data)
+    if change.resource == "tags" and "parent" in data:
+        parent = data["parent"]
+        if parent is not None and parent not in tags:
+            return False, [
+                f"  ❌ Skipping '{change.name}': parent '{parent}' doesn't exist"
+            ]
+        if parent:
+            data["parent"] = tags[parent]["id"]
+        elif change.action == "create":
+            del data["parent"]
+        else:
+            data["parent"] = None
+    if change.resource == "workflows" and "assign_tags" in data:
+        missing = [name for name in data["assign_tags"] if name not in tags]
+        if missing:
+            return False, [
+                f"  ❌ Skipping '{change.name}': no tag {', '.join(missing)}"
+            ]
+        tag_ids = [tags[name]["id"] for name in data.pop("assign_tags")]
+        if change.action == "create":
+            data = workflow_payload(change.name, tag_ids)
+        else:
+            # Send every action back, with the assignment one retagged
+            current = index["workflows"][change.old.get("name", change.name)]
+            actions = [dict(action) for action in current.get("actions", [])]
+            action = assignment_action({"actions": actions})
+            if action is None:
+                actions.append(workflow_payload(change.name, tag_ids)["actions"][0])
+            else:
+                action["assign_tags"] = tag_ids
+            data["actions"] = actions
+
     try:
-        api_post("workflows", workflow_data)
-        print("  ✅ Created inbox workflow: Auto-add inbox tag on consumption")
-    except requests.exceptions.HTTPError as e:
-        print(f"  ❌ Failed to create inbox workflow: {e}")
-        print(f"     Response: {e.response.text if hasattr(e, 'response') else 'N/A'}")
+        if change.action == "create":
+            result = api_post(change.resource, {"name": change.name, **data})
+        else:
+            assert change.obj_id is not None
+            result = api_patch(change.resource, change.obj_id, data)
+    except requests.exceptions.RequestException as e:
+        lines = [f"  ❌ Failed to {change.action} '{change.name}': {e}"]
+        if e.response is not None:
+            lines.append(f"     Response: {e.response.text}")
+        return False, lines
+
+    live = index[change.resource]
+    if "name" in change.old:
+        live.pop(change.old["name"], None)
+    live[change.name] = result
+    verb = "Created" if change.action == "create" else "Updated"
+    return True, [f"  ✅ {verb} {change.resource}: {change.name}"]
+
+
+def dependency_levels(changes: List[Change]) -> List[List[Change]]:
+    """Split tag and workflow changes into batches that can run concurrently
+
+    Tags go level by level so every parent exists before its children are
+    created or moved under it. Within a level, updates (renames included)
+    run before creates, in case a create reuses a name a rename frees up.
+    Workflows come last since they refer to tags by ID.
+    """
+    levels: Dict[Tuple[int, bool], List[Change]] = {}
+    for change in changes:
+        if change.resource == "tags":
+            levels.setdefault((change.depth, change.action == "create"), []).append(
+                change
+            )
+    batches = [levels[key] for key in sorted(levels)]
+    workflows = [c for c in changes if c.resource == "workflows"]
+    if workflows:
+        batches.append(workflows)
+    return batches
+
+
+def apply(changes: List[Change], index: Dict[str, Dict[str, Dict]]) -> int:
+    """Apply a plan concurrently; returns the number of changes that failed
+
+    Document types and custom fields depend on nothing, so they share the
+    pool with the first batch of tags and finish whenever they finish; each
+    tag/workflow batch from dependency_levels() waits for the one before.
+    Results are printed in plan order as each batch completes.
+    """
+    print("\n=== Applying ===")
+    independent = [
+        c for c in changes if c.resource in ("document_types", "custom_fields")
+    ]
+    batches = dependency_levels(changes)
+    # resource -> [created, updated, failed]
+    counts: Dict[str, List[int]] = {}
+
+    def report(batch: List[Change], futures: List[Future]) -> None:
+        for change, future in zip(batch, futures):
+            ok, lines = future.result()
+            for line in lines:
+                print(line)
+            tally = counts.setdefault(change.resource, [0, 0, 0])
+            if not ok:
+                tally[2] += 1
+            else:
+                tally[0 if change.action == "create" else 1] += 1
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        batch = batches[0] if batches else []
+        futures = [pool.submit(apply_change, c, index) for c in batch]
+        # Queued behind the first tag level rather than ahead of it
+        background = [pool.submit(apply_change, c, index) for c in independent]
+        for next_batch in batches[1:]:
+            report(batch, futures)
+            batch = next_batch
+            futures = [pool.submit(apply_change, c, index) for c in batch]
+        report(batch, futures)
+        report(independent, background)
+
+    print()
+    for resource in RESOURCES:
+        if resource in counts:
+            created, updated, failed = counts[resource]
+            label = resource.replace("_", " ").title()
+            print(
+                f"{label} Summary: {created} created, {updated} updated, "
+                f"{failed} failed"
+            )
+    return sum(tally[2] for tally in counts.values())
 
 
 def main():
     """Main setup function"""
+    parser = argparse.ArgumentParser(
+        description="Converge Paperless-NGX on a declarative taxonomy spec"
+    )
+    parser.add_argument(
+        "command",
+        nargs="?",
+        choices=["plan", "apply"],
+        default="apply",
+        help="Show the changes, or make them (default: apply)",
+    )
+    parser.add_argument(
+        "--spec",
+        type=Path,
+        default=DEFAULT_SPEC,
+        help=f"YAML or JSON taxonomy spec (default: {DEFAULT_SPEC.name})",
+    )
+    args = parser.parse_args()
+
     print("=" * 60)
     print("Paperless-NGX Setup Script")
     print("=" * 60)
     print(f"Target URL: {PAPERLESS_URL}")
+    print(f"Spec: {args.spec}")
 
     try:
-        # Test connection
-        print("\n🔍 Testing API connection...")
-        # Test with tags endpoint (simple and always exists)
-        tags_response = api_get("tags")
-        print(
-            f"✅ Connected to Paperless (found {tags_response.get('count', 0)} existing tags)"
-        )
+        spec = load_spec(args.spec)
+    except (OSError, ValueError) as e:
+        print(f"\n❌ Invalid spec: {e}")
+        sys.exit(1)
+
+    try:
+        # Loading the existing objects doubles as the connection test
+        print("\n🔍 Reading current state...")
+        index = load_index()
+        print(f"✅ Connected to Paperless (found {len(index['tags'])} existing tags)")
+
+        changes = plan(spec, index)
+        print_plan(changes)
+        if args.command == "plan" or not changes:
+            return
 
-        # Create all resources
-        create_tags()
-        create_document_types()
-        create_custom_fields()
-        create_inbox_workflow()
+        failed = apply(changes, index)
 
         print("\n" + "=" * 60)
+        if failed:
+            print(f"⚠️  {failed} change(s) failed - review errors above")
+            print("=" * 60)
+            sys.exit(1)
         print("✅ Setup Complete!")
         print("=" * 60)
         print("\nNext steps:")